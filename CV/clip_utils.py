@@ -18,9 +18,17 @@ from config import (
     CLIP_EXPECTED_VS_UNRELATED,
     CLIP_MAX_UNRELATED_ALLOWED,
     VIEW_REQUIRED_MARGINS,
+    PRODUCT_INSPECTION_VIEWS,
     CONFIG
 )
 
+# View name → product category, built once from the inspection plans
+VIEW_TO_CATEGORY = {
+    view: category
+    for category, plan in PRODUCT_INSPECTION_VIEWS.items()
+    for view in plan["views"]
+}
+
 # ---------------- Load CLIP ----------------
 @st.cache_resource
 def load_clip():
@@ -121,12 +129,7 @@ def clip_view_check(image_file, view_name):
     top_idx = int(top2.indices[0])
     
     # Determine product type from view name
-    product_type = "Laptop"
-    for mobile_view in ["Front screen", "Back panel", "Left side (buttons)", 
-                        "Right side (buttons)", "Bottom edge (charging port)", "Camera close-up"]:
-        if view_name == mobile_view:
-            product_type = "Mobile"
-            break
+    product_type = VIEW_TO_CATEGORY.get(view_name, "Laptop")
             
     REQUIRED_MARGIN = VIEW_REQUIRED_MARGINS.get(
         view_name,
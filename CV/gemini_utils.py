@@ -186,15 +186,12 @@ def generate_report_with_gemini(analysis_results, product_name, product_type, us
         model = genai.GenerativeModel("gemini-2.5-flash")
 
         # Build an issues summary for the prompt
-        issues_lines = []
-        total_issues = 0
-        for view, analysis in analysis_results.items():
-            issues = analysis.get("issues", [])
-            if not issues:
-                continue
-            total_issues += len(issues)
-            for iss in issues:
-                issues_lines.append(f"View: {view} - {iss.get('type','unknown')} ({iss.get('severity','n/a')}) at {iss.get('location','N/A')}: {iss.get('description','')}")
+        issues_lines = [
+            f"View: {view} - {iss.get('type','unknown')} ({iss.get('severity','n/a')}) at {iss.get('location','N/A')}: {iss.get('description','')}"
+            for view, analysis in analysis_results.items()
+            for iss in analysis.get("issues", [])
+        ]
+        total_issues = len(issues_lines)
 
         issues_text = "\n".join(issues_lines) if issues_lines else "No damage detected - pristine condition."
 
@@ -1,13 +1,78 @@
 import streamlit as st
 import requests
-import json
-from style_utils import inject_custom_css
+import orjson
+from io import BytesIO
+from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-NLP_API_URL = "http://localhost:5000/cv-to-pricing"
+NLP_STREAM_URL = "http://localhost:5000/cv-to-pricing/stream"
 
-def render():
-    inject_custom_css()
+# Shared HTTP session so reruns reuse the pooled keep-alive connection to the
+# NLP API; transient gateway errors (e.g. NLP restarts) are retried
+_adapter = HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset(["POST"])
+    )
+)
+_session = requests.Session()
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+def _stream_pricing(payload_json):
+    """
+    POST the pricing payload to the NLP streaming endpoint
+    
+    Args:
+        payload_json: Request payload serialized (bytes) with sorted keys
     
+    Yields:
+        Stage messages: {"stage": "pricing", ...}, then {"stage": "report_delta",
+        "text": ...} chunks, then {"stage": "complete", ...}
+    """
+    with _session.post(
+        NLP_STREAM_URL,
+        data=payload_json,
+        headers={"Content-Type": "application/json"},
+        timeout=(3, 45),  # (connect, read)
+        stream=True
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                yield orjson.loads(line)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _thumbnail(image_bytes, max_width=480):
+    """Downscale an uploaded photo once; reruns reuse the cached JPEG bytes"""
+    img = Image.open(BytesIO(image_bytes)).convert("RGB")
+    img.thumbnail((max_width, max_width * 2))
+    buffered = BytesIO()
+    img.save(buffered, format="JPEG", quality=85, optimize=True)
+    return buffered.getvalue()
+
+def _render_pricing(pricing):
+    st.markdown("### 💰 Price Estimation")
+    p_col1, p_col2, p_col3 = st.columns(3)
+    p_col1.metric("Market Price", f"EGP {pricing.get('reference_new_price', 0):,.0f}")
+    p_col2.metric("Fair Used Value", f"EGP {pricing.get('calculated_used_price', 0):,.0f}")
+    p_col3.metric("Depreciation", f"{pricing.get('discount_percentage', 0)}%")
+
+def _render_report(report):
+    # Bilingual Tabs
+    st.markdown("### 📄 Technical Justification")
+    tab_en, tab_ar = st.tabs(["English Report", "التقرير الفني"])
+    with tab_en:
+        st.markdown(f'<div class="report-card">{report.get("english")}</div>', unsafe_allow_html=True)
+    with tab_ar:
+        st.markdown(f'<div class="report-card rtl-text">{report.get("arabic")}</div>', unsafe_allow_html=True)
+
+def render():
     st.title("📊 Inspection & Valuation Report")
     
     res = st.session_state.analysis_results
@@ -25,13 +90,12 @@ def render():
 
     # Visual Inspection Section
     st.markdown("### 📷 Visual Inspection Details")
-    total_issues = 0
     
     for view, analysis in res.items():
         with st.container():
             col1, col2 = st.columns([1, 2])
             with col1:
-                st.image(st.session_state.uploaded_files[view], use_container_width=True)
+                st.image(_thumbnail(st.session_state.uploaded_files[view].getvalue()), use_container_width=True)
             with col2:
                 issues = analysis.get("issues", [])
                 overall = analysis.get("overall_condition", "unknown")
@@ -40,10 +104,11 @@ def render():
                 if not issues:
                     st.success("✅ Condition: Pristine")
                 else:
-                    total_issues += len(issues)
                     st.warning(f"⚠️ Condition: {overall.upper()}")
-                    for issue in issues:
-                        st.write(f"- {issue.get('type')}: {issue.get('description')}")
+                    st.markdown("\n".join(
+                        f"- {issue.get('type')}: {issue.get('description')}"
+                        for issue in issues
+                    ))
 
     # Pricing & Reports
     st.divider()
@@ -56,28 +121,40 @@ def render():
                     "usage_years": usage_years,
                     "analysis_results": res
                 }
-                response = requests.post(NLP_API_URL, json=payload, timeout=45)
+                payload_json = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    pricing = result.get('pricing', {})
-                    report = result.get('report', {})
-
+                # Completed results are kept per session so reruns with the same
+                # inputs render instantly without another round-trip
+                cache = st.session_state.setdefault("pricing_results", {})
+                result = cache.get(payload_json)
+                pricing_slot = st.empty()
+                report_slot = st.empty()
+                
+                if result is None:
+                    # Show pricing as soon as it streams in, then the report
+                    # text as it is generated
+                    report_text = []
+                    for message in _stream_pricing(payload_json):
+                        stage = message.get("stage")
+                        if stage == "pricing":
+                            with pricing_slot.container():
+                                _render_pricing(message.get('pricing', {}))
+                        elif stage == "report_delta":
+                            report_text.append(message.get('text', ''))
+                            report_slot.markdown("".join(report_text))
+                        elif stage == "complete":
+                            result = message
+                    if result and result.get('success'):
+                        cache[payload_json] = result
+                
+                if result and result.get('success'):
                     # Removed st.balloons() as requested
-                    
-                    st.markdown("### 💰 Price Estimation")
-                    p_col1, p_col2, p_col3 = st.columns(3)
-                    p_col1.metric("Market Price", f"EGP {pricing.get('reference_new_price', 0):,.0f}")
-                    p_col2.metric("Fair Used Value", f"EGP {pricing.get('calculated_used_price', 0):,.0f}")
-                    p_col3.metric("Depreciation", f"{pricing.get('discount_percentage', 0)}%")
-
-                    # Bilingual Tabs
-                    st.markdown("### 📄 Technical Justification")
-                    tab_en, tab_ar = st.tabs(["English Report", "التقرير الفني"])
-                    with tab_en:
-                        st.markdown(f'<div class="report-card">{report.get("english")}</div>', unsafe_allow_html=True)
-                    with tab_ar:
-                        st.markdown(f'<div class="report-card rtl-text">{report.get("arabic")}</div>', unsafe_allow_html=True)
+                    with pricing_slot.container():
+                        _render_pricing(result.get('pricing', {}))
+                    with report_slot.container():
+                        _render_report(result.get('report', {}))
+                elif result:
+                    st.error(result.get('message') or result.get('error', 'Pricing failed'))
             except Exception as e:
                 st.error(f"Connection Error: {str(e)}")
 
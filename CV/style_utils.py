@@ -1,8 +1,8 @@
 import streamlit as st
-import requests
 
-def inject_custom_css():
-    st.markdown("""
+# Built once at import; re-emitted on every rerun because Streamlit drops
+# elements that are not rendered again
+CUSTOM_CSS = """
         <style>
         /* 1. Hide default Streamlit sidebar navigation links */
         [data-testid="stSidebarNav"] {
@@ -62,9 +62,13 @@ def inject_custom_css():
             font-weight: 700 !important;
         }
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+def inject_custom_css():
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 def load_lottie_url(url: str):
+    import requests
     try:
         r = requests.get(url)
         return r.json() if r.status_code == 200 else None
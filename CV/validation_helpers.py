@@ -9,7 +9,6 @@ import numpy as np
 from io import BytesIO
 
 from config import PRODUCT_INSPECTION_VIEWS, CONFIG
-from clip_utils import clip_view_check
 
 # ---------------- Helpers ----------------
 def get_inspection_views(product_type):
@@ -118,6 +117,8 @@ def get_cached_validation(file_bytes, view_name, product_type):
     if level == "borderline":
         st.warning(f"⚠️ Borderline sharpness (score={score:.1f}) — accepted")
     
+    # Imported here so page 1 (inspection plan) does not load CLIP
+    from clip_utils import clip_view_check
     v_ok, v_reasons, v_info = clip_view_check(f, view_name)
     if not v_ok:
         return False, v_reasons, v_info
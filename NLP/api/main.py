@@ -1,8 +1,17 @@
+import logging
 import os
 import sys
-from flask import Flask, request, jsonify
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from dotenv import load_dotenv
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 
+# Library modules read their API keys from the environment, so .env is
+# loaded here, before any of them is constructed
+load_dotenv()
+
 current_dir = os.path.dirname(os.path.abspath(__file__))
 root_dir = os.path.dirname(current_dir)
 if root_dir not in sys.path:
@@ -11,11 +20,12 @@ if root_dir not in sys.path:
 try:
     from src.data_processing.input_validator import InputValidator
     from src.nlp_engine.text_generator import TextGenerator
-    from src.nlp_engine.bilingual_report_generator import BilingualReportGenerator
+    from src.nlp_engine.bilingual_report_generator import get_bilingual_generator
     from src.pricing.price_calculator import PriceCalculator
     from src.pricing.discount_explainer import DiscountExplainer
     from src.external.product_specs_extractor import ProductSpecsExtractor
     from src.services.cv_integration_service import CVIntegrationService  # 🆕 NEW
+    from src.utils.logging_setup import configure_logging
     print("✅ All modules imported successfully!")
 except ImportError as e:
     print(f"❌ IMPORT ERROR: {e}")
@@ -23,11 +33,33 @@ except ImportError as e:
     traceback.print_exc()
     sys.exit(1)
 
+configure_logging(os.getenv('LOG_LEVEL', 'INFO').upper())
+logger = logging.getLogger(__name__)
+
+# NumPy values (batch pricing/validation) and non-string keys serialize as-is
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+class _ORJSONProvider(JSONProvider):
+    """Route jsonify and request.get_json through orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=_ORJSON_OPTIONS), mimetype='application/json'
+        )
+
 app = Flask(__name__)
+app.json = _ORJSONProvider(app)
 CORS(app)
 
 text_generator = TextGenerator()
-bilingual_generator = BilingualReportGenerator()
+bilingual_generator = get_bilingual_generator()
 specs_extractor = ProductSpecsExtractor()
 
 SERP_KEY = os.getenv('SERPAPI_KEY', "your-key-here")
@@ -40,13 +72,68 @@ validator = InputValidator()
 # ✅ New code (the class now loads keys internally via os.getenv)
 cv_service = CVIntegrationService()
 
+def _json_response(payload, status_code=200):
+    """Serialize a response body with orjson instead of jsonify"""
+    return Response(
+        orjson.dumps(payload, option=_ORJSON_OPTIONS),
+        status=status_code,
+        mimetype='application/json'
+    )
+
+# Static, so serialized once; a fresh Response per probe because after-request
+# hooks (CORS) modify response headers in place
+_HEALTH_BODY = orjson.dumps({
+    'status': 'healthy', 
+    'service': 'dynamic-pricing-nlp',
+    'features': ['cv_integration', 'price_search', 'specs_extraction', 'bilingual_reports']
+})
+
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({
-        'status': 'healthy', 
-        'service': 'dynamic-pricing-nlp',
-        'features': ['cv_integration', 'price_search', 'specs_extraction', 'bilingual_reports']
-    })
+    return Response(_HEALTH_BODY, mimetype='application/json')
+
+def _parse_cv_payload(data):
+    """
+    Validate a CV → pricing request body
+    
+    Returns:
+        Tuple of (workflow_kwargs, error_message); exactly one is None
+    """
+    if not data:
+        return None, 'No JSON data received'
+
+    # Extract required fields
+    product_name = data.get('product_name')
+    product_type = data.get('product_type')
+    usage_years = data.get('usage_years', 0)
+    analysis_results = data.get('analysis_results', {})
+    
+    if not (product_name and product_type and analysis_results):
+        return None, 'Required fields: product_name, product_type, analysis_results'
+
+    return {
+        'product_name': product_name,
+        'product_type': product_type,
+        'usage_years': usage_years,
+        'gemini_analysis': analysis_results
+    }, None
+
+def _read_cv_payload():
+    """
+    Parse and validate the CV → pricing request body
+    
+    Returns:
+        Tuple of (workflow_kwargs, error_response); exactly one is None
+    """
+    raw_body = request.get_data()
+    try:
+        data = orjson.loads(raw_body) if raw_body else None
+    except orjson.JSONDecodeError:
+        return None, (jsonify({'error': 'Request body is not valid JSON'}), 400)
+    workflow_kwargs, error = _parse_cv_payload(data)
+    if error:
+        return None, (jsonify({'error': error}), 400)
+    return workflow_kwargs, None
 
 @app.route('/cv-to-pricing', methods=['POST'])
 def cv_to_pricing():
@@ -55,39 +142,104 @@ def cv_to_pricing():
     This is the main integration endpoint for Streamlit CV app
     """
     try:
-        data = request.json
-        if not data:
-            return jsonify({'error': 'No JSON data received'}), 400
-
-        # Extract required fields
-        product_name = data.get('product_name')
-        product_type = data.get('product_type')
-        usage_years = data.get('usage_years', 0)
-        analysis_results = data.get('analysis_results', {})
-        
-        if not all([product_name, product_type, analysis_results]):
-            return jsonify({
-                'error': 'Required fields: product_name, product_type, analysis_results'
-            }), 400
+        workflow_kwargs, error_response = _read_cv_payload()
+        if error_response:
+            return error_response
 
         # 🆕 NEW - Use Service Layer instead of inline logic
-        result = cv_service.process_complete_workflow(
-            product_name=product_name,
-            product_type=product_type,
-            usage_years=usage_years,
-            gemini_analysis=analysis_results
-        )
+        result = cv_service.process_complete_workflow(**workflow_kwargs)
         
         # Return response with appropriate status code
         status_code = 200 if result.get('success') else 404
-        return jsonify(result), status_code
+        return _json_response(result, status_code)
 
     except Exception as e:
-        print(f"🔥 Error in cv_to_pricing: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in cv_to_pricing")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/cv-to-pricing/stream', methods=['POST'])
+def cv_to_pricing_stream():
+    """
+    Same workflow as /cv-to-pricing, streamed as JSON lines:
+    {"stage": "pricing", ...} as soon as pricing is ready, then
+    {"stage": "complete", ...} with the full response
+    """
+    try:
+        workflow_kwargs, error_response = _read_cv_payload()
+        if error_response:
+            return error_response
+    except Exception as e:
+        logger.exception("Error in cv_to_pricing_stream")
+        return jsonify({'error': str(e)}), 500
+
+    def generate():
+        for stage, payload in cv_service.iter_complete_workflow(**workflow_kwargs, stream_report=True):
+            yield orjson.dumps({'stage': stage, **payload}, option=_ORJSON_OPTIONS) + b'\n'
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+def _batch_cv_to_pricing(body):
+    """Run one /cv-to-pricing sub-request of a batch"""
+    workflow_kwargs, error = _parse_cv_payload(body)
+    if error:
+        return {'status': 400, 'body': {'error': error}}
+    
+    try:
+        result = cv_service.process_complete_workflow(**workflow_kwargs)
+    except Exception as e:
+        logger.exception("Error in batch cv_to_pricing")
+        return {'status': 500, 'body': {'error': str(e)}}
+    
+    return {'status': 200 if result.get('success') else 404, 'body': result}
+
+# Endpoints that can be called from /batch, by path
+_BATCH_HANDLERS = {
+    '/cv-to-pricing': _batch_cv_to_pricing
+}
+_BATCH_MAX_REQUESTS = 20
+
+# Shared across batches, so at most this many workflows (and SerpAPI
+# searches) run concurrently no matter how many batches arrive
+_batch_executor = ThreadPoolExecutor(max_workers=4)
+
+def _dispatch_batch_request(sub_request):
+    """Route one batch entry to its handler"""
+    if not isinstance(sub_request, dict):
+        return {'status': 400, 'body': {'error': 'Each request must be an object'}}
+    
+    handler = _BATCH_HANDLERS.get(sub_request.get('path'))
+    if handler is None:
+        return {'status': 404, 'body': {'error': f"Unsupported path: {sub_request.get('path')}"}}
+    
+    body = sub_request.get('body')
+    if not isinstance(body, dict):
+        return {'status': 400, 'body': {'error': 'Request body must be a JSON object'}}
+    
+    return handler(body)
+
+@app.route('/batch', methods=['POST'])
+def batch():
+    """
+    Run several sub-requests in one round trip:
+    {"requests": [{"path": "/cv-to-pricing", "body": {...}}, ...]}
+    Responds with {"responses": [{"status": ..., "body": ...}, ...]} in
+    request order; sub-requests run concurrently
+    """
+    raw_body = request.get_data()
+    try:
+        data = orjson.loads(raw_body) if raw_body else None
+    except orjson.JSONDecodeError:
+        return jsonify({'error': 'Request body is not valid JSON'}), 400
+    sub_requests = data.get('requests') if isinstance(data, dict) else None
+    
+    if not isinstance(sub_requests, list) or not sub_requests:
+        return jsonify({'error': 'Required field: requests (non-empty list)'}), 400
+    if len(sub_requests) > _BATCH_MAX_REQUESTS:
+        return jsonify({'error': f'At most {_BATCH_MAX_REQUESTS} requests per batch'}), 400
+    
+    responses = list(_batch_executor.map(_dispatch_batch_request, sub_requests))
+    return _json_response({'responses': responses})
+
 # ... (keep all other endpoints unchanged)
 
 if __name__ == '__main__':
@@ -96,6 +248,8 @@ if __name__ == '__main__':
     print(f"📍 Host: http://127.0.0.1:5000")
     print(f"📚 Endpoints:")
     print(f"   - POST /cv-to-pricing       (CV Integration - MAIN)")
+    print(f"   - POST /cv-to-pricing/stream (CV Integration - streamed)")
+    print(f"   - POST /batch               (Several requests at once)")
     print(f"   - POST /calculate-price     (Price calculation)")
     print(f"   - POST /generate-report     (Bilingual report)")
     print(f"   - POST /extract-specs       (Product specs)")
@@ -103,4 +257,8 @@ if __name__ == '__main__':
     print(f"   - GET  /health              (Health check)")
     print("="*70 + "\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Development server only. In production run under gunicorn so several
+    # CV clients can overlap their SerpAPI/LLM I/O:
+    #   gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 api.main:app
+    debug = os.getenv('FLASK_DEBUG', 'False').lower() in ('1', 'true')
+    app.run(debug=debug, host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file
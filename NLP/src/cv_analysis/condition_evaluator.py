@@ -2,7 +2,39 @@
 Condition Evaluator - Extracts structured condition data from Gemini CV analysis
 """
 
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List
+import orjson
+
+
+@dataclass(slots=True, frozen=True)
+class Issue:
+    """A single detected damage item (compact, immutable)."""
+    type: str
+    severity: str
+    location: str
+    impact: float
+    view: str
+    
+    def to_dict(self) -> Dict:
+        return {
+            'type': self.type,
+            'severity': self.severity,
+            'location': self.location,
+            'impact': self.impact,
+            'view': self.view
+        }
+
+
+@lru_cache(maxsize=256)
+def _evaluate_cached(payload_key: bytes, usage_years: float) -> Dict:
+    """Evaluate a serialized Gemini payload (memoized across evaluators)."""
+    return ConditionEvaluator._evaluate(orjson.loads(payload_key), usage_years)
+
 
 class ConditionEvaluator:
     """
@@ -21,6 +53,13 @@ class ConditionEvaluator:
         'broken': 1.0
     }
     
+    # Condition priority order (worst to best) and its integer ranks
+    CONDITION_PRIORITY = (
+        'broken', 'damaged', 'poor', 'fair',
+        'good', 'very good', 'excellent'
+    )
+    CONDITION_RANK = {level: rank for rank, level in enumerate(CONDITION_PRIORITY)}
+    
     # Severity weights for discount calculation
     SEVERITY_WEIGHTS = {
         'minor': 0.02,      # 2% impact
@@ -29,6 +68,51 @@ class ConditionEvaluator:
         'critical': 0.15    # 15% impact
     }
     
+    # Condition score deduction per issue severity
+    SEVERITY_DEDUCTIONS = {
+        'critical': 1.5,
+        'severe': 1.0,
+        'moderate': 0.5,
+        'minor': 0.2
+    }
+    
+    # (discount impact, score deduction) per severity, resolved with a single
+    # lookup per issue; unknown severities cost as much as a minor one
+    SEVERITY_COSTS = dict(zip(
+        SEVERITY_WEIGHTS,
+        zip(SEVERITY_WEIGHTS.values(), map(SEVERITY_DEDUCTIONS.get, SEVERITY_WEIGHTS))
+    ))
+    DEFAULT_SEVERITY_COST = (0.02, 0.2)
+    
+    # Singular issue type per damage_details key; other keys fall back to
+    # stripping a trailing 's'
+    DAMAGE_TYPES = {
+        'scratches': 'scratch',
+        'cracks': 'crack',
+        'dents': 'dent',
+        'chips': 'chip',
+        'dings': 'ding',
+        'marks': 'mark',
+        'stains': 'stain',
+        'scuffs': 'scuff'
+    }
+    
+    # Zeroed severity distribution template (read-only; copy before use)
+    EMPTY_SEVERITY_DISTRIBUTION = MappingProxyType({
+        'minor': 0,
+        'moderate': 0,
+        'severe': 0,
+        'critical': 0
+    })
+    
+    # Immutable fields of the default (no CV analysis) condition
+    DEFAULT_CONDITION = MappingProxyType({
+        'overall_condition': 'good',
+        'condition_score': 7.0,
+        'total_discount_impact': 0.0,
+        'issues_count': 0
+    })
+    
     def evaluate_from_gemini(
         self, 
         gemini_analysis: Dict, 
@@ -77,44 +161,96 @@ class ConditionEvaluator:
         if not gemini_analysis:
             return self._get_default_condition(usage_years)
         
-        # Collect all conditions and issues from all views
+        # Fast path: no view reports damage details (the common pristine
+        # case), so only the overall condition needs to be resolved
+        if not any(analysis.get('damage_details') for analysis in gemini_analysis.values()):
+            overall_condition = self._determine_overall_condition([
+                analysis.get('overall_condition', 'good').lower()
+                for analysis in gemini_analysis.values()
+            ])
+            result = self._get_default_condition(usage_years)
+            result['overall_condition'] = overall_condition
+            result['condition_score'] = self.CONDITION_SCORES.get(overall_condition, 7.0)
+            result['views_analyzed'] = list(gemini_analysis.keys())
+            return result
+        
+        # Identical payloads (e.g. Streamlit reruns) hit the cache; keys are
+        # not sorted so view order is preserved. Cached issues are frozen, so
+        # callers get fresh containers instead of a deep copy
+        payload_key = orjson.dumps(gemini_analysis)
+        cached = _evaluate_cached(payload_key, usage_years)
+        return {
+            **cached,
+            'detected_issues': [issue.to_dict() for issue in cached['detected_issues']],
+            'severity_distribution': dict(cached['severity_distribution']),
+            'views_analyzed': list(cached['views_analyzed'])
+        }
+    
+    @classmethod
+    def _evaluate(cls, gemini_analysis: Dict, usage_years: float) -> Dict:
+        """Compute condition metrics for a non-empty Gemini analysis."""
+        # Collect conditions and issues and accumulate the score deduction,
+        # discount impact and severity distribution in a single pass
         all_conditions = []
         all_issues = []
+        add_condition = all_conditions.append
+        add_issue = all_issues.append
+        severity_cost = cls.SEVERITY_COSTS.get
+        default_cost = cls.DEFAULT_SEVERITY_COST
+        damage_types = cls.DAMAGE_TYPES
+        severity_dist = dict(cls.EMPTY_SEVERITY_DISTRIBUTION)
+        total_deduction = 0.0
+        total_impact = 0.0
+        
+        # Labels are interned so downstream table lookups hit on identity
+        intern = sys.intern
         
         for view_name, analysis in gemini_analysis.items():
-            condition = analysis.get('overall_condition', 'good').lower()
-            all_conditions.append(condition)
-            
-            # Extract damage details
-            damage_details = analysis.get('damage_details', {})
+            add_condition(intern(analysis.get('overall_condition', 'good').lower()))
+            view_lower = view_name.lower()
             
-            for damage_type, items in damage_details.items():
-                if items and isinstance(items, list):
-                    for item in items:
-                        issue = self._create_issue_entry(
-                            damage_type=damage_type,
-                            view=view_name,
-                            details=item
-                        )
-                        all_issues.append(issue)
+            # Extract damage details, e.g. "scratches": [{"severity": "minor",
+            # "location": "top-left"}] on "Back" becomes
+            # Issue(type="scratch", severity="minor",
+            #       location="back top-left", impact=0.02, view="Back")
+            for damage_type, items in analysis.get('damage_details', {}).items():
+                if not items or not isinstance(items, list):
+                    continue
+                
+                # Normalize damage type to its singular form
+                damage_type = damage_type.lower()
+                normalized_type = damage_types.get(damage_type) or damage_type.rstrip('s')
+                
+                for item in items:
+                    severity = intern(item.get('severity', 'minor').lower())
+                    impact, deduction = severity_cost(severity, default_cost)
+                    add_issue(Issue(
+                        normalized_type,
+                        severity,
+                        f"{view_lower} {item.get('location', '')}".strip(),
+                        impact,
+                        view_name
+                    ))
+                    
+                    total_impact += impact
+                    total_deduction += deduction
+                    if severity in severity_dist:
+                        severity_dist[severity] += 1
         
         # Determine overall condition (worst case scenario)
-        overall_condition = self._determine_overall_condition(all_conditions)
+        overall_condition = cls._determine_overall_condition(all_conditions)
         
-        # Calculate condition score
-        base_score = self.CONDITION_SCORES.get(overall_condition, 7.0)
-        condition_score = self._adjust_score_for_issues(base_score, all_issues)
+        # Deduct issue points from the base score, with a minimum of 1.0
+        base_score = cls.CONDITION_SCORES.get(overall_condition, 7.0)
+        condition_score = max(1.0, base_score - total_deduction)
         
-        # Calculate severity distribution
-        severity_dist = self._calculate_severity_distribution(all_issues)
-        
-        # Calculate total discount impact
-        total_impact = self._calculate_discount_impact(all_issues)
+        # Cap the additional discount used by PriceCalculator at 30%
+        total_impact = min(0.30, total_impact)
         
         return {
             'overall_condition': overall_condition,
             'condition_score': round(condition_score, 2),
-            'detected_issues': all_issues,
+            'detected_issues': tuple(all_issues),
             'severity_distribution': severity_dist,
             'total_discount_impact': round(total_impact, 3),
             'usage_years': usage_years,
@@ -122,150 +258,28 @@ class ConditionEvaluator:
             'issues_count': len(all_issues)
         }
     
-    def _create_issue_entry(
-        self, 
-        damage_type: str, 
-        view: str, 
-        details: Dict
-    ) -> Dict:
-        """
-        Create a standardized issue entry.
-        
-        Args:
-            damage_type: "scratches", "cracks", "dents", etc.
-            view: "Front", "Back", "Side", etc.
-            details: {"severity": "minor", "location": "top-left"}
-        
-        Returns:
-            {
-                "type": "scratch",
-                "severity": "minor",
-                "location": "back top-left",
-                "impact": 0.02
-            }
-        """
-        # Normalize damage type (remove plural)
-        normalized_type = damage_type.rstrip('s').lower()
-        
-        # Get severity
-        severity = details.get('severity', 'minor').lower()
-        
-        # Combine view and location
-        detail_location = details.get('location', '')
-        full_location = f"{view.lower()} {detail_location}".strip()
-        
-        # Get impact weight
-        impact = self.SEVERITY_WEIGHTS.get(severity, 0.02)
-        
-        return {
-            'type': normalized_type,
-            'severity': severity,
-            'location': full_location,
-            'impact': impact,
-            'view': view
-        }
-    
-    def _determine_overall_condition(self, conditions: List[str]) -> str:
+    @classmethod
+    def _determine_overall_condition(cls, conditions: List[str]) -> str:
         """
         Determine overall condition from multiple view conditions.
         Uses worst-case scenario (most damaged condition wins).
         """
-        if not conditions:
-            return 'good'
+        # Find worst condition in one pass; unknown labels rank last
+        rank = cls.CONDITION_RANK
+        unknown = len(rank)
+        worst = min(conditions, key=lambda c: rank.get(c, unknown), default='good')
         
-        # Priority order (worst to best)
-        priority = [
-            'broken', 'damaged', 'poor', 'fair', 
-            'good', 'very good', 'excellent'
-        ]
-        
-        # Find worst condition
-        for level in priority:
-            if level in conditions:
-                return level
-        
-        return 'good'
-    
-    def _adjust_score_for_issues(
-        self, 
-        base_score: float, 
-        issues: List[Dict]
-    ) -> float:
-        """
-        Adjust condition score based on number and severity of issues.
-        """
-        if not issues:
-            return base_score
-        
-        # Deduct points based on issues
-        total_deduction = 0
-        
-        for issue in issues:
-            severity = issue.get('severity', 'minor')
-            
-            # Deduction per issue type
-            deductions = {
-                'critical': 1.5,
-                'severe': 1.0,
-                'moderate': 0.5,
-                'minor': 0.2
-            }
-            
-            total_deduction += deductions.get(severity, 0.2)
-        
-        # Apply deduction with minimum score of 1.0
-        adjusted_score = max(1.0, base_score - total_deduction)
-        
-        return adjusted_score
-    
-    def _calculate_severity_distribution(self, issues: List[Dict]) -> Dict:
-        """Calculate how many issues of each severity level exist."""
-        distribution = {
-            'minor': 0,
-            'moderate': 0,
-            'severe': 0,
-            'critical': 0
-        }
-        
-        for issue in issues:
-            severity = issue.get('severity', 'minor')
-            if severity in distribution:
-                distribution[severity] += 1
-        
-        return distribution
-    
-    def _calculate_discount_impact(self, issues: List[Dict]) -> float:
-        """
-        Calculate total discount impact as a percentage.
-        This will be used by PriceCalculator for additional discounting.
-        
-        Returns:
-            Float between 0.0 and 1.0 (e.g., 0.15 = 15% additional discount)
-        """
-        if not issues:
-            return 0.0
-        
-        total_impact = sum(issue.get('impact', 0.02) for issue in issues)
-        
-        # Cap maximum impact at 30% (0.30)
-        return min(0.30, total_impact)
+        return worst if worst in rank else 'good'
     
     def _get_default_condition(self, usage_years: float) -> Dict:
         """Return default condition when no CV analysis is available."""
+        # Callers mutate the result, so containers are always fresh
         return {
-            'overall_condition': 'good',
-            'condition_score': 7.0,
+            **self.DEFAULT_CONDITION,
             'detected_issues': [],
-            'severity_distribution': {
-                'minor': 0,
-                'moderate': 0,
-                'severe': 0,
-                'critical': 0
-            },
-            'total_discount_impact': 0.0,
+            'severity_distribution': dict(self.EMPTY_SEVERITY_DISTRIBUTION),
             'usage_years': usage_years,
-            'views_analyzed': [],
-            'issues_count': 0
+            'views_analyzed': []
         }
     
     def get_condition_summary(self, evaluation: Dict) -> str:
@@ -292,19 +306,12 @@ class ConditionEvaluator:
         if not issues:
             return "none"
         
-        # Group by severity
-        by_severity = {}
-        for issue in issues:
-            sev = issue['severity']
-            if sev not in by_severity:
-                by_severity[sev] = []
-            by_severity[sev].append(f"{issue['type']} on {issue['location']}")
+        # Count by severity
+        by_severity = Counter(issue['severity'] for issue in issues)
         
         # Format output
-        parts = []
-        for severity in ['critical', 'severe', 'moderate', 'minor']:
-            if severity in by_severity:
-                count = len(by_severity[severity])
-                parts.append(f"{count} {severity} issue(s)")
-        
-        return ", ".join(parts)
\ No newline at end of file
+        return ", ".join(
+            f"{by_severity[severity]} {severity} issue(s)"
+            for severity in ('critical', 'severe', 'moderate', 'minor')
+            if severity in by_severity
+        )
\ No newline at end of file
@@ -1,5 +1,18 @@
+import heapq
 from src.utils.config import Config
 
+_ISSUE_PRIORITY = Config.ISSUE_PRIORITIES.get
+_CANONICAL_TYPE = Config.canonical_issue_type
+_SEVERITY_WEIGHT = Config.SEVERITY_WEIGHTS.get
+
+def _issue_score(issue):
+    """Priority x severity x confidence score used to rank issues"""
+    return (
+        _ISSUE_PRIORITY(_CANONICAL_TYPE(issue.get('type', '')), 0)
+        * _SEVERITY_WEIGHT(issue.get('severity', 'minor'), 1)
+        * issue.get('confidence', 0.5)
+    )
+
 class FeatureExtractor:
     """Extract and process features from CV output"""
     
@@ -32,20 +45,8 @@ class FeatureExtractor:
         """Find the most critical issue based on priority and severity"""
         issues = cv_data.get('detected_issues', [])
         
-        if not issues:
-            return None
-        
-        scored_issues = []
-        for issue in issues:
-            priority = Config.get_issue_priority(issue.get('type', ''))
-            severity_weight = Config.get_severity_weight(issue.get('severity', 'minor'))
-            confidence = issue.get('confidence', 0.5)
-            
-            score = priority * severity_weight * confidence
-            scored_issues.append((score, issue))
-        
-        scored_issues.sort(reverse=True, key=lambda x: x[0])
-        return scored_issues[0][1] if scored_issues else None
+        # Single pass; ties keep the first issue, as the stable sort did
+        return max(issues, key=_issue_score, default=None)
     
     def _analyze_locations(self, cv_data):
         """Analyze distribution of issues across locations"""
@@ -66,18 +67,8 @@ class FeatureExtractor:
         if not issues:
             return []
         
-        scored_issues = []
-        for issue in issues:
-            priority = Config.get_issue_priority(issue.get('type', ''))
-            severity_weight = Config.get_severity_weight(issue.get('severity', 'minor'))
-            confidence = issue.get('confidence', 0.5)
-            
-            score = priority * severity_weight * confidence
-            scored_issues.append((score, issue))
-        
-        scored_issues.sort(reverse=True, key=lambda x: x[0])
-        
-        return [issue for _, issue in scored_issues[:max_issues]]
+        # Partial selection instead of sorting every issue
+        return heapq.nlargest(max_issues, issues, key=_issue_score)
     
     def calculate_overall_impact_score(self, cv_data):
         """Calculate overall impact score from all issues"""
@@ -86,13 +77,7 @@ class FeatureExtractor:
         if not issues:
             return 0.0
         
-        total_impact = 0
-        for issue in issues:
-            priority = Config.get_issue_priority(issue.get('type', ''))
-            severity_weight = Config.get_severity_weight(issue.get('severity', 'minor'))
-            confidence = issue.get('confidence', 0.5)
-            
-            total_impact += priority * severity_weight * confidence
+        total_impact = sum(map(_issue_score, issues))
         
         max_possible = len(issues) * 5 * 3 * 1.0
         normalized_score = (total_impact / max_possible) * 10 if max_possible > 0 else 0
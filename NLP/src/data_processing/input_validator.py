@@ -5,15 +5,32 @@ class InputValidator:
     REQUIRED_ISSUE_FIELDS = ['type', 'location', 'severity', 'confidence']
     VALID_CONDITIONS = ['excellent', 'good', 'fair', 'poor']
     VALID_SEVERITIES = ['minor', 'moderate', 'severe']
+    REQUIRED_PRICING_FIELDS = ['reference_new_price', 'calculated_used_price', 'discount_percentage']
+    INVALID_CONDITION_ERROR = f"Invalid condition. Use: {VALID_CONDITIONS}"
+    
+    # Set views for membership fast paths; the lists above keep message order
+    _CV_FIELD_SET = frozenset(REQUIRED_CV_FIELDS)
+    _ISSUE_FIELD_SET = frozenset(REQUIRED_ISSUE_FIELDS)
+    _CONDITION_SET = frozenset(VALID_CONDITIONS)
+    _PRICING_FIELD_SET = frozenset(REQUIRED_PRICING_FIELDS)
     
     @staticmethod
     def validate_cv_output(cv_data):
         """Validate structure of Computer Vision analysis results"""
+        if not isinstance(cv_data, dict):
+            return {
+                'valid': False,
+                'errors': [f"Missing required field: {field}" for field in InputValidator.REQUIRED_CV_FIELDS]
+            }
+        
         errors = []
         
-        for field in InputValidator.REQUIRED_CV_FIELDS:
-            if field not in cv_data:
-                errors.append(f"Missing required field: {field}")
+        if not InputValidator._CV_FIELD_SET <= cv_data.keys():
+            errors.extend(
+                f"Missing required field: {field}"
+                for field in InputValidator.REQUIRED_CV_FIELDS
+                if field not in cv_data
+            )
         
         if 'condition_score' in cv_data:
             score = cv_data['condition_score']
@@ -21,36 +38,46 @@ class InputValidator:
                 errors.append("condition_score must be between 0 and 10")
         
         if 'overall_condition' in cv_data:
-            if cv_data['overall_condition'] not in InputValidator.VALID_CONDITIONS:
-                errors.append(f"Invalid condition. Use: {InputValidator.VALID_CONDITIONS}")
+            condition = cv_data['overall_condition']
+            if not isinstance(condition, str) or condition not in InputValidator._CONDITION_SET:
+                errors.append(InputValidator.INVALID_CONDITION_ERROR)
         
         if 'detected_issues' in cv_data:
             if not isinstance(cv_data['detected_issues'], list):
                 errors.append("detected_issues must be a list")
             else:
+                required = InputValidator._ISSUE_FIELD_SET
                 for idx, issue in enumerate(cv_data['detected_issues']):
-                    issue_errors = InputValidator._validate_issue(issue, idx)
-                    errors.extend(issue_errors)
+                    if isinstance(issue, dict) and required <= issue.keys():
+                        continue
+                    errors.extend(InputValidator._validate_issue(issue, idx))
         
         return {'valid': len(errors) == 0, 'errors': errors}
     
     @staticmethod
     def _validate_issue(issue, index):
         """Validate individual issue attributes"""
-        errors = []
-        for field in InputValidator.REQUIRED_ISSUE_FIELDS:
-            if field not in issue:
-                errors.append(f"Issue {index}: Missing field '{field}'")
-        return errors
-
+        # Non-object issues have none of the required fields
+        if not isinstance(issue, dict):
+            issue = {}
+        return [
+            f"Issue {index}: Missing field '{field}'"
+            for field in InputValidator.REQUIRED_ISSUE_FIELDS
+            if field not in issue
+        ]
+    
     @staticmethod
     def validate_pricing_data(pricing_data):
         """Validate output from the pricing calculation module"""
         errors = []
-        required_fields = ['reference_new_price', 'calculated_used_price', 'discount_percentage']
         
-        for field in required_fields:
-            if field not in pricing_data:
-                errors.append(f"Missing required pricing field: {field}")
+        if not (isinstance(pricing_data, dict) and InputValidator._PRICING_FIELD_SET <= pricing_data.keys()):
+            if not isinstance(pricing_data, dict):
+                pricing_data = {}
+            errors.extend(
+                f"Missing required pricing field: {field}"
+                for field in InputValidator.REQUIRED_PRICING_FIELDS
+                if field not in pricing_data
+            )
         
-        return {'valid': len(errors) == 0, 'errors': errors}
\ No newline at end of file
+        return {'valid': len(errors) == 0, 'errors': errors}
@@ -1,7 +1,18 @@
-import json
+import orjson
 import os
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+@lru_cache(maxsize=4096)
+def _cache_key(brand: str, model: str, category: str = None) -> str:
+    """Build the cache key (memoized: the same SKUs are looked up repeatedly)"""
+    key = f"{brand.lower()}_{model.lower()}"
+    if category:
+        key += f"_{category.lower()}"
+    return key.replace(' ', '_')
 
 class PriceCache:
     """
@@ -9,81 +20,165 @@ class PriceCache:
     Reduces load and improves response time
     """
     
-    def __init__(self, cache_file='data/price_cache.json', expiry_days=7):
+    def __init__(self, cache_file='data/price_cache.json', expiry_days=7, compact_every=100):
         self.cache_file = cache_file
+        # Updates are appended here and folded into cache_file on compaction
+        self.journal_file = os.path.splitext(cache_file)[0] + '.jsonl'
         self.expiry_days = expiry_days
+        self._expiry_seconds = expiry_days * 86400
+        self.compact_every = compact_every
+        self._journal_entries = 0
+        # Serializes cache mutation, journal appends and compaction; /batch
+        # runs several workflows that share one cache. Reentrant because
+        # appends can trigger compaction
+        self._lock = threading.RLock()
         self.cache = self._load_cache()
     
     def _load_cache(self) -> Dict:
-        """Load cache from file"""
-        if not os.path.exists(self.cache_file):
-            return {}
+        """Load cache snapshot from file, then replay the journal"""
+        cache = {}
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    cache = orjson.loads(f.read())
+            except:
+                cache = {}
+        
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except ValueError:
+                        continue  # Torn trailing write
+                    if record['entry'] is None:
+                        cache.pop(record['key'], None)
+                    else:
+                        cache[record['key']] = record['entry']
+                    self._journal_entries += 1
         
-        try:
-            with open(self.cache_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
+        return cache
+    
+    def _append(self, key: str, entry: Optional[Dict]):
+        """Journal a single update (entry=None means delete)"""
+        self._append_many([(key, entry)])
+    
+    def _append_many(self, records: List[Tuple[str, Optional[Dict]]]):
+        """Journal several updates with a single write"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.journal_file) or '.', exist_ok=True)
+            
+            with open(self.journal_file, 'ab') as f:
+                f.write(b''.join(
+                    orjson.dumps({'key': key, 'entry': entry}) + b'\n'
+                    for key, entry in records
+                ))
+            
+            self._journal_entries += len(records)
+            if self._journal_entries >= self.compact_every:
+                self._save_cache()
     
     def _save_cache(self):
-        """Save cache to file"""
-        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-        
-        with open(self.cache_file, 'w') as f:
-            json.dump(self.cache, f, indent=2)
+        """Write a full snapshot atomically and reset the journal"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            
+            tmp_file = self.cache_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(self.cache, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, self.cache_file)
+            
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self._journal_entries = 0
     
     def _generate_key(self, brand: str, model: str, category: str = None) -> str:
         """Generate unique cache key"""
-        key = f"{brand.lower()}_{model.lower()}"
-        if category:
-            key += f"_{category.lower()}"
-        return key.replace(' ', '_')
+        return _cache_key(brand, model, category)
+    
+    @staticmethod
+    def _entry_epoch(entry: Dict) -> float:
+        """Entry creation time as Unix epoch (legacy entries only have 'timestamp')"""
+        ts = entry.get('ts')
+        if ts is None:
+            ts = datetime.fromisoformat(entry['timestamp']).timestamp()
+        return ts
     
     def get(self, brand: str, model: str, category: str = None) -> Optional[Dict]:
         """Get cached price if available and not expired"""
         key = self._generate_key(brand, model, category)
         
-        if key not in self.cache:
-            return None
+        with self._lock:
+            cached_data = self.cache.get(key)
+            if cached_data is None:
+                return None
+            
+            if time.time() - self._entry_epoch(cached_data) > self._expiry_seconds:
+                del self.cache[key]
+                self._append(key, None)
+                return None
         
-        cached_data = self.cache[key]
-        cached_time = datetime.fromisoformat(cached_data['timestamp'])
+        return cached_data['price_data']
+    
+    def get_many(self, items: Iterable[Tuple[str, str, Optional[str]]]) -> List[Optional[Dict]]:
+        """
+        Look up several (brand, model, category) items at once.
+        Returns price data (or None) in input order; expired entries are
+        dropped with a single journal write.
+        """
+        now = time.time()
+        results = []
+        expired = []
         
-        if datetime.now() - cached_time > timedelta(days=self.expiry_days):
-            del self.cache[key]
-            self._save_cache()
-            return None
+        with self._lock:
+            for brand, model, category in items:
+                key = self._generate_key(brand, model, category)
+                cached_data = self.cache.get(key)
+                
+                if cached_data is not None and now - self._entry_epoch(cached_data) > self._expiry_seconds:
+                    del self.cache[key]
+                    expired.append((key, None))
+                    cached_data = None
+                
+                results.append(cached_data['price_data'] if cached_data else None)
+            
+            if expired:
+                self._append_many(expired)
         
-        return cached_data['price_data']
+        return results
     
     def set(self, brand: str, model: str, price_data: Dict, category: str = None):
         """Cache price data"""
         key = self._generate_key(brand, model, category)
         
-        self.cache[key] = {
-            'timestamp': datetime.now().isoformat(),
+        now = time.time()
+        entry = {
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+            'ts': int(now),
             'price_data': price_data
         }
         
-        self._save_cache()
+        with self._lock:
+            self.cache[key] = entry
+            self._append(key, entry)
     
     def clear_expired(self):
         """Remove expired entries"""
-        now = datetime.now()
-        expired_keys = []
-        
-        for key, data in self.cache.items():
-            cached_time = datetime.fromisoformat(data['timestamp'])
-            if now - cached_time > timedelta(days=self.expiry_days):
-                expired_keys.append(key)
-        
-        for key in expired_keys:
-            del self.cache[key]
-        
-        if expired_keys:
-            self._save_cache()
+        now = time.time()
+        with self._lock:
+            expired_keys = [
+                key for key, data in self.cache.items()
+                if now - self._entry_epoch(data) > self._expiry_seconds
+            ]
+            
+            for key in expired_keys:
+                del self.cache[key]
+            
+            if expired_keys:
+                self._save_cache()
     
     def clear_all(self):
         """Clear entire cache"""
-        self.cache = {}
-        self._save_cache()
\ No newline at end of file
+        with self._lock:
+            self.cache = {}
+            self._save_cache()
\ No newline at end of file
@@ -1,8 +1,23 @@
-import json
+import logging
+import orjson
 import os
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Optional
 
+logger = logging.getLogger(__name__)
+
+# Last parse per absolute path: (mtime_ns, size, products); a save replaces the entry
+_PARSE_CACHE: Dict[str, tuple] = {}
+
+@lru_cache(maxsize=4096)
+def _db_key(brand: str, model: str) -> str:
+    """Build the product key (memoized: the same SKUs are looked up repeatedly)"""
+    key = f"{brand}_{model}".lower()
+    key = key.replace(' ', '_').replace('-', '_')
+    return ''.join(c for c in key if c.isalnum() or c == '_')
+
 class PriceDatabase:
     """
     Local database for product prices
@@ -11,24 +26,42 @@ class PriceDatabase:
     
     def __init__(self, db_file='data/price_database.json'):
         self.db_file = db_file
+        self._batch_depth = 0
         self.prices = self._load_database()
+        self._rebuild_search_index()
     
     def _load_database(self) -> Dict:
-        """Load price database from file"""
-        if not os.path.exists(self.db_file):
+        """Load price database from file (reuses the last parse if unchanged)"""
+        try:
+            st = os.stat(self.db_file)
+        except OSError:
             return {}
         
+        path = os.path.abspath(self.db_file)
+        cached = _PARSE_CACHE.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return self._copy_products(cached[2])
+        
         try:
-            with open(self.db_file, 'r') as f:
-                data = json.load(f)
-                return data.get('products', {})
+            with open(self.db_file, 'rb') as f:
+                products = orjson.loads(f.read()).get('products', {})
+            _PARSE_CACHE[path] = (st.st_mtime_ns, st.st_size, products)
+            return self._copy_products(products)
         except Exception as e:
-            print(f"Error loading price database: {e}")
+            logger.error("Error loading price database: %s", e)
             return {}
     
+    @staticmethod
+    def _copy_products(products: Dict) -> Dict:
+        # Per-entry copies so instances never share the cached product dicts
+        return {key: dict(product) for key, product in products.items()}
+    
     def _save_database(self):
-        """Save price database to file"""
-        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+        """Write the database atomically (skipped while inside batch())"""
+        if self._batch_depth:
+            return
+        
+        os.makedirs(os.path.dirname(self.db_file) or '.', exist_ok=True)
         
         data = {
             'products': self.prices,
@@ -36,14 +69,45 @@ class PriceDatabase:
             'total_products': len(self.prices)
         }
         
-        with open(self.db_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        tmp_file = self.db_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.db_file)
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group several add_price/delete_price calls into a single save:
+        
+            with db.batch():
+                for brand, model, price in rows:
+                    db.add_price(brand, model, price)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._save_database()
+    
+    def _rebuild_search_index(self):
+        """Precompute lowercase search text per product (brand NUL model)"""
+        self._search_text = {
+            key: self._search_text_for(product)
+            for key, product in self.prices.items()
+        }
+    
+    @staticmethod
+    def _search_text_for(product: Dict) -> str:
+        # NUL separator keeps a query from matching across brand and model
+        return f"{product['brand']}\0{product['model']}".lower()
     
     def _generate_key(self, brand: str, model: str) -> str:
         """Generate consistent key for product"""
-        key = f"{brand}_{model}".lower()
-        key = key.replace(' ', '_').replace('-', '_')
-        return ''.join(c for c in key if c.isalnum() or c == '_')
+        return _db_key(brand, model)
     
     def get_price(self, brand: str, model: str) -> Optional[Dict]:
         """Get price for product from database"""
@@ -76,6 +140,7 @@ class PriceDatabase:
             'last_updated': datetime.now().isoformat(),
             'currency': 'USD'
         }
+        self._search_text[key] = self._search_text_for(self.prices[key])
         
         self._save_database()
     
@@ -85,6 +150,7 @@ class PriceDatabase:
         
         if key in self.prices:
             del self.prices[key]
+            self._search_text.pop(key, None)
             self._save_database()
             return True
         
@@ -93,14 +159,12 @@ class PriceDatabase:
     def search_products(self, query: str) -> list:
         """Search products by brand or model"""
         query_lower = query.lower()
-        results = []
-        
-        for key, product in self.prices.items():
-            if (query_lower in product['brand'].lower() or 
-                query_lower in product['model'].lower()):
-                results.append(product)
         
-        return results
+        return [
+            self.prices[key]
+            for key, text in self._search_text.items()
+            if query_lower in text
+        ]
     
     def list_all(self) -> Dict:
         """List all products in database"""
@@ -1,7 +1,58 @@
+import logging
 from typing import List, Dict, Optional
-from serpapi import GoogleSearch
 import re
 import os
+from bisect import bisect_right
+from functools import lru_cache
+from operator import itemgetter
+import orjson
+from src.utils.http import create_session
+
+logger = logging.getLogger(__name__)
+
+_SERPAPI_URL = "https://serpapi.com/search.json"
+
+# EGP prices must carry a currency marker, before or after the number
+_EGP_PRICE_PATTERNS = (
+    re.compile(r'(?:EGP|LE|ج\.م|جنيه)\s*([0-9,]+(?:\.[0-9]{2})?)', re.IGNORECASE),
+    re.compile(r'([0-9,]+(?:\.[0-9]{2})?)\s*(?:EGP|LE|ج\.م|جنيه)', re.IGNORECASE)
+)
+
+# Words that indicate a nearby number is NOT a price
+_INVALID_PRICE_CONTEXT = ("star", "rating", "review", "piece", "item", "year",
+                          "warranty", "month", "قسط", "شهور")
+
+# Any price-like number with an optional currency marker
+_PRICE_RE = re.compile(r'(?:USD|EGP|\$|€)?\s*([0-9]{1,3}(?:,[0-9]{3})+(?:\.[0-9]{1,2})?|[0-9]+(?:\.[0-9]{1,2})?)')
+
+# URL fragment -> store name, checked in order
+_STORE_NAMES = (
+    ("jumia", "Jumia Egypt"),
+    ("noon", "Noon"),
+    ("b.tech", "B.TECH"),
+    ("dream2000", "Dream 2000"),
+    ("dubaiphone", "Dubai Phone"),
+    ("xcite", "Xcite"),
+    ("souq", "Souq")
+)
+
+# Separates snippets in extract_prices_batch; neither a digit nor whitespace,
+# so no match can span two snippets
+_SNIPPET_SENTINEL = '\x00'
+
+def _parse_price(match) -> float:
+    """Convert a _PRICE_RE match to a float"""
+    return float(match.group(1).replace(',', ''))
+
+@lru_cache(maxsize=1024)
+def _store_from_url(url: str) -> str:
+    """Map a result URL to a store name (memoized: stores repeat across results)"""
+    url_lower = url.lower()
+    for key, name in _STORE_NAMES:
+        if key in url_lower:
+            return name
+    
+    return "Egyptian Retailer"
 
 class PriceSearchEngine:
     def __init__(self, api_key: str = None):
@@ -11,6 +62,10 @@ class PriceSearchEngine:
             "dream2000.com", "b.tech", "xcite.com", "souq.com","elarabygroup.com","2b.com.eg"
         ]
         self.used_keywords = ["used", "refurbished", "مستعمل", "مجدد", "open box", "renewed"]
+        # The site restriction does not depend on the product, so build it once
+        self._site_query = " OR ".join(f"site:{site}" for site in self.egyptian_sites)
+        # Keep-alive session; transient failures (429/5xx, resets) are retried
+        self._session = create_session()
 
     def search_product_price(self, brand: str, model: str, category: str = None) -> Dict:
         """Main entry point for PriceCalculator"""
@@ -24,10 +79,9 @@ class PriceSearchEngine:
         if not self.api_key:
             return []
         
-        site_query = " OR ".join([f"site:{site}" for site in self.egyptian_sites])
         params = {
             "engine": "google",
-            "q": f'"{product}" NEW price Egypt {site_query} -used -مستعمل',
+            "q": f'"{product}" NEW price Egypt {self._site_query} -used -مستعمل',
             "location": "Cairo, Egypt",
             "hl": "en",
             "num": 30,
@@ -35,12 +89,13 @@ class PriceSearchEngine:
         }
         
         try:
-            search = GoogleSearch(params)
-            results = search.get_dict().get("organic_results", [])
-            print(f"[SEARCH] Found {len(results)} raw results for: {product}")
+            response = self._session.get(_SERPAPI_URL, params=params, timeout=(3, 15))
+            response.raise_for_status()
+            results = orjson.loads(response.content).get("organic_results", [])
+            logger.debug("[SEARCH] Found %d raw results for: %s", len(results), product)
             return results
         except Exception as e:
-            print(f"[SEARCH ERROR] {e}")
+            logger.warning("[SEARCH ERROR] %s", e)
             return []
 
     def process_results(self, results: List[Dict], product: str) -> List[Dict]:
@@ -53,12 +108,13 @@ class PriceSearchEngine:
             link = r.get("link", "")
             
             # Filter used/refurbished
-            text = f"{title} {snippet}".lower()
-            if any(k in text for k in self.used_keywords):
+            text = f"{title} {snippet}"
+            text_lower = text.lower()
+            if any(k in text_lower for k in self.used_keywords):
                 continue
             
-            # Extract price
-            price = self.extract_price(f"{title} {snippet}")
+            # Extract price (reusing the lowered text for context checks)
+            price = self._extract_egp_price(text, text_lower)
             if not price:
                 continue
             
@@ -73,33 +129,27 @@ class PriceSearchEngine:
             })
         
         # Sort by price (cheapest first)
-        processed = sorted(processed, key=lambda x: x["price"])
+        processed.sort(key=itemgetter("price"))
         
-        print(f"[PROCESS] Extracted {len(processed)} valid prices")
+        logger.debug("[PROCESS] Extracted %d valid prices", len(processed))
         if processed:
-            print(f"[PROCESS] Price range: EGP {processed[0]['price']:,.0f} - {processed[-1]['price']:,.0f}")
+            logger.debug(
+                "[PROCESS] Price range: EGP %.0f - %.0f",
+                processed[0]['price'], processed[-1]['price']
+            )
         
         return processed
 
     def extract_price(self, text: str) -> Optional[float]:
         """Extract Egyptian pound prices from text"""
-        text_lower = text.lower()
-        
-        # Words that indicate this number is NOT a price
-        invalid_context = ["star", "rating", "review", "piece", "item", "year", 
-                        "warranty", "month", "قسط", "شهور"]
-        
-        # Patterns that must have currency symbols
-        patterns = [
-            r'(?:EGP|LE|ج\.م|جنيه)\s*([0-9,]+(?:\.[0-9]{2})?)',
-            r'([0-9,]+(?:\.[0-9]{2})?)\s*(?:EGP|LE|ج\.م|جنيه)'
-        ]
-        
+        return self._extract_egp_price(text, text.lower())
+
+    def _extract_egp_price(self, text: str, text_lower: str) -> Optional[float]:
+        """extract_price for a caller that already has text.lower()"""
         found_prices = []
         
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in _EGP_PRICE_PATTERNS:
+            for match in pattern.finditer(text):
                 try:
                     price_str = match.group(1).replace(',', '')
                     price_val = float(price_str)
@@ -109,7 +159,7 @@ class PriceSearchEngine:
                     context = text_lower[max(0, start-20):min(len(text_lower), end+20)]
                     
                     # Skip if context has invalid words
-                    if any(word in context for word in invalid_context):
+                    if any(word in context for word in _INVALID_PRICE_CONTEXT):
                         continue
                     
                     # Price must be reasonable (100 - 200,000 EGP)
@@ -126,32 +176,46 @@ class PriceSearchEngine:
         # Return the highest valid price found (usually the actual product price)
         return max(found_prices)
 
+    def _extract_price_from_text(self, text: str) -> Optional[float]:
+        """Extract the first price-like number (any currency) from text"""
+        match = _PRICE_RE.search(text)
+        return _parse_price(match) if match else None
+
+    def extract_prices_batch(self, snippets: List[str]) -> List[Optional[float]]:
+        """
+        _extract_price_from_text for several snippets with one regex pass
+        over a sentinel-joined buffer. Returns prices in input order.
+        """
+        prices = [None] * len(snippets)
+        if not snippets:
+            return prices
+        
+        # Start offset of each snippet in the joined buffer
+        starts = []
+        offset = 0
+        for snippet in snippets:
+            starts.append(offset)
+            offset += len(snippet) + len(_SNIPPET_SENTINEL)
+        
+        for match in _PRICE_RE.finditer(_SNIPPET_SENTINEL.join(snippets)):
+            idx = bisect_right(starts, match.start(1)) - 1
+            if prices[idx] is None:
+                prices[idx] = _parse_price(match)
+        
+        return prices
+
     def extract_store(self, url: str) -> str:
         """Extract store name from URL"""
-        store_map = {
-            "jumia": "Jumia Egypt",
-            "noon": "Noon",
-            "b.tech": "B.TECH",
-            "dream2000": "Dream 2000",
-            "dubaiphone": "Dubai Phone",
-            "xcite": "Xcite",
-            "souq": "Souq"
-        }
-        
-        url_lower = url.lower()
-        for key, name in store_map.items():
-            if key in url_lower:
-                return name
-        
-        return "Egyptian Retailer"
+        return _store_from_url(url)
 
     def create_report(self, product: str, results: List[Dict]) -> Dict:
         """
-        Build the dictionary that PriceCalculator expects
+        Build the dictionary that PriceCalculator expects from results
+        sorted cheapest first (as returned by process_results)
         IMPORTANT: Must return 'results' array for search_details to work!
         """
         if not results:
-            print(f"[REPORT] No results found for: {product}")
+            logger.info("[REPORT] No results found for: %s", product)
             return {
                 "price": None,
                 "source": "Not Found",
@@ -160,13 +224,16 @@ class PriceSearchEngine:
                 "results": []  # Empty but present
             }
         
-        prices = [r["price"] for r in results]
-        min_price = min(prices)
-        max_price = max(prices)
-        median_price = sorted(prices)[len(prices)//2]
+        # process_results sorts cheapest first, so the statistics are plain
+        # index lookups instead of extra passes and a second sort
+        min_price = results[0]["price"]
+        max_price = results[-1]["price"]
+        median_price = results[len(results)//2]["price"]
         
-        print(f"[REPORT] Success! {len(results)} results")
-        print(f"[REPORT] Best price: EGP {min_price:,.2f} at {results[0]['store']}")
+        logger.info(
+            "[REPORT] %d results, best price: EGP %.2f at %s",
+            len(results), min_price, results[0]['store']
+        )
         
         return {
             "price": median_price,  # Return median price
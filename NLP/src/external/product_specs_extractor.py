@@ -1,35 +1,51 @@
-import requests
-import json
+import copy
+import logging
 import os
 import re
-from typing import Dict, Optional
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import orjson
+from src.utils.http import create_session
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Strips markdown code fences from LLM JSON replies
+_CODE_FENCE_RE = re.compile(r'```json|```')
 
 class ProductSpecsExtractor:
     def __init__(self):
-        load_dotenv()
         self.serpapi_key = os.getenv("SERPAPI_KEY")
         self.google_key = os.getenv("GOOGLE_API_KEY")
         self.model_id = "gemini-2.5-flash"
         self.gemini_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model_id}:generateContent?key={self.google_key}"
+        self._session = create_session()
+        # Successful extractions keyed on (brand, model, category)
+        self._specs_cache = TTLCache(maxsize=512, ttl=24 * 3600)
 
     def extract_specs(self, brand: str, model: str, category: Optional[str] = None) -> Dict:
         """
         بيسيرش في جوجل ويحول النتائج لمواصفات تقنية صريحة.
         """
-        print(f"\n[Specs Extractor] 🔍 Deep-searching for: {brand} {model} using {self.model_id}")
+        cache_key = (brand.lower().strip(), model.lower().strip(), category)
+        cached = self._specs_cache.get(cache_key)
+        if cached is not None:
+            # Deep copy: callers may edit the nested specifications
+            return copy.deepcopy(cached)
+        
+        logger.debug("Extracting specs for %s %s using %s", brand, model, self.model_id)
         
         try:
             # 1 SerpAPI
             query = f"{brand} {model} full technical specifications display processor camera battery"
             params = {"q": query, "api_key": self.serpapi_key, "num": 5}
-            search_res = requests.get("https://serpapi.com/search.json", params=params, timeout=10)
-            results = search_res.json().get('organic_results', [])
+            search_res = self._session.get("https://serpapi.com/search.json", params=params, timeout=10)
+            results = orjson.loads(search_res.content).get('organic_results', [])[:4]
             
             if not results:
                 return self._create_failure_response(brand, model)
             
-            context = " ".join([f"{r.get('title')}: {r.get('snippet')}" for r in results[:4]])
+            context = " ".join([f"{r.get('title')}: {r.get('snippet')}" for r in results])
 
             # 2 Gemini API
             prompt = f"""Extract full tech specs for {brand} {model} from text: {context}.
@@ -37,26 +53,44 @@ class ProductSpecsExtractor:
             Be very detailed. No markdown formatting or backticks."""
 
             payload = {"contents": [{"parts": [{"text": prompt}]}]}
-            ai_res = requests.post(self.gemini_url, json=payload, timeout=20)
+            ai_res = self._session.post(self.gemini_url, json=payload, timeout=20)
             
             if ai_res.status_code == 200:
-                raw_text = ai_res.json()['candidates'][0]['content']['parts'][0]['text']
+                raw_text = orjson.loads(ai_res.content)['candidates'][0]['content']['parts'][0]['text']
                 # Clean up any unwanted formatting
-                clean_json = re.sub(r'```json|```', '', raw_text).strip()
+                clean_json = _CODE_FENCE_RE.sub('', raw_text).strip()
                 
-                return {
+                specs = {
                     "product_name": f"{brand} {model}",
-                    "specifications": json.loads(clean_json),
+                    "specifications": orjson.loads(clean_json),
                     "extraction_status": "success"
                 }
+                self._specs_cache.set(cache_key, specs)
+                return copy.deepcopy(specs)
             else:
-                print(f"⚠️ Gemini API Error: {ai_res.status_code}")
+                logger.warning("Gemini API error: %s", ai_res.status_code)
                 return self._create_failure_response(brand, model)
                 
-        except Exception as e:
-            print(f"❌ Extractor Error: {str(e)}")
+        except Exception:
+            logger.exception("Specs extraction failed for %s %s", brand, model)
             return self._create_failure_response(brand, model)
 
+    def extract_specs_batch(
+        self,
+        items: List[Tuple[str, str, Optional[str]]],
+        max_workers: int = 8
+    ) -> List[Dict]:
+        """
+        Extract specs for several (brand, model, category) items concurrently.
+        The calls are network-bound, so threads overlap the SerpAPI/Gemini waits.
+        Results are returned in input order.
+        """
+        if not items:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(lambda item: self.extract_specs(*item), items))
+
     def _create_failure_response(self, brand, model):
         return {
             "product_name": f"{brand} {model}",
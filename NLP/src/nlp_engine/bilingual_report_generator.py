@@ -1,31 +1,190 @@
-import requests
-import json
+import hashlib
+import logging
 import os
 import re
 import time
-from typing import Dict, List, Optional
-from dotenv import load_dotenv
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import orjson
+from functools import lru_cache, wraps
+from src.utils.http import create_session
+from src.utils.rate_limit import TokenBucket
+from src.utils.single_flight import SingleFlight
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Section markers in the generated bilingual report
+_ENGLISH_SECTION_RE = re.compile(r'\[ENGLISH\](.*?)(?=\[ARABIC\]|$)', re.DOTALL | re.IGNORECASE)
+_ARABIC_SECTION_RE = re.compile(r'\[ARABIC\](.*?)$', re.DOTALL | re.IGNORECASE)
+_ARABIC_CHAR_RE = re.compile('[\u0600-\u06FF]')
+
+# Worst-case condition/severity ranking for the report condition summary
+_CONDITION_PRIORITY = {"poor": 0, "fair": 1, "good": 2, "excellent": 3}
+_SEVERITY_RANK = {"moderate": 2, "severe": 3, "major": 3}
+_SEVERITY_LABELS = ("none", "minor", "moderate", "severe")
+
+# Static skeleton of the Gemini report prompt; identical inputs always
+# produce a byte-identical prompt
+_FOCUSED_PROMPT_TEMPLATE = """You are a professional tech product evaluator writing a pricing justification report.
+
+PRODUCT: {product_name}
+USAGE: {usage_years} year(s)
+CONDITION: {condition}
+
+INSPECTION RESULTS:
+{issues_text}
+
+KEY SPECIFICATIONS:
+{specs_text}
+{market_context}
+PRICING:
+• Original New Price: EGP {new_price:,.2f}
+• Fair Used Price: EGP {used_price:,.2f}
+• Discount: {discount:.0f}%
+
+INSTRUCTIONS:
+Write EXACTLY ONE professional paragraph (5-6 sentences) that:
+1. Opens with device name, usage period, and verified condition
+2. References 2-3 key specifications that retain value
+3. Honestly describes condition impact on pricing (mention issues if present)
+4. {pricing_task}
+5. Concludes with final price and value proposition
+
+CRITICAL REQUIREMENTS:
+- Be honest about condition issues
+- Justify price based on actual inspection results
+- Use professional but accessible language
+- Keep it concise (one paragraph only)
+
+Format your response EXACTLY as:
+
+[ENGLISH]
+Your English paragraph here (5-6 sentences, professional tone)
+
+[ARABIC]
+الفقرة بالعربية هنا (5-6 جمل، لغة احترافية)
+
+Note: Arabic translation must be natural and professional, not literal word-for-word translation."""
+
+_MARKET_CONTEXT_TEMPLATE = (
+    "\nMARKET COMPARISON:\n"
+    "• Similar devices selling at: EGP {market_price:,.2f}\n"
+    "• Price advantage: {price_diff:.0f}% {direction}\n"
+)
+
+# Specs mentioned in the prompt, with their display labels
+_KEY_SPECS = tuple(
+    (key, key.title())
+    for key in ('display', 'processor', 'ram', 'storage', 'battery', 'camera')
+)
+
+# Fallback report building blocks
+_CONDITION_AR = {
+    'excellent': 'ممتازة',
+    'good': 'جيدة',
+    'fair': 'مقبولة',
+    'poor': 'ضعيفة'
+}
+
+_FALLBACK_PRICE_EN = (
+    "Based on the inspection results and current condition, the fair market price is EGP {used_price:,.2f}, "
+    "which represents a {discount:.0f}% discount from the original retail price of EGP {new_price:,.2f}. "
+    "This pricing ensures fair value for both buyers and sellers based on actual device condition."
+)
+
+_FALLBACK_PRICE_AR = (
+    "بناءً على نتائج الفحص والحالة الحالية، السعر العادل في السوق هو {used_price:,.2f} جنيه مصري، "
+    "مما يمثل خصم {discount:.0f}٪ من سعر البيع الأصلي البالغ {new_price:,.2f} جنيه مصري. "
+    "يضمن هذا السعر قيمة عادلة للمشترين والبائعين بناءً على حالة الجهاز الفعلية."
+)
+
+# Expected discount range (%) per condition, checked by validate_pricing_logic
+_EXPECTED_DISCOUNT_RANGE = {
+    'excellent': (15, 35),
+    'good': (30, 50),
+    'fair': (50, 70),
+    'poor': (70, 85)
+}
+
+class RateLimitError(Exception):
+    """API answered 429; retry_after is the server's Retry-After hint (seconds)"""
+    
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@lru_cache(maxsize=512)
+def _walk_analysis(payload_key: bytes) -> tuple:
+    """
+    Flatten a serialized analysis_results payload in one traversal:
+    ((view, overall_condition or None, ((damage_type, severity, count), ...)), ...)
+    Severity is that of the first item; non-list damage entries count once.
+    """
+    list_type = list
+    views = []
+    for view, analysis in orjson.loads(payload_key).items():
+        damages = tuple(
+            (
+                damage_type,
+                items[0].get('severity', 'minor') if type(items) is list_type else 'minor',
+                len(items) if type(items) is list_type else 1
+            )
+            for damage_type, items in analysis.get('damage_details', {}).items()
+            if items
+        )
+        views.append((view, analysis.get('overall_condition'), damages))
+    return tuple(views)
+
+
+@lru_cache(maxsize=512)
+def _extract_condition_cached(payload_key: bytes) -> Dict:
+    """Summarize a serialized analysis_results payload (memoized across generators)."""
+    # Fold worst condition and worst severity in a single pass
+    condition_priority = _CONDITION_PRIORITY
+    severity_rank = _SEVERITY_RANK
+    overall = "good"
+    worst_rank = len(condition_priority)
+    max_severity = 0
+    all_issues = []
+    
+    for view, condition, damages in _walk_analysis(payload_key):
+        condition = ('good' if condition is None else condition).lower()
+        rank = condition_priority.get(condition, 2)
+        if rank < worst_rank:
+            worst_rank, overall = rank, condition
+        
+        view_lower = view.lower()
+        for damage_type, severity, _count in damages:
+            all_issues.append(f"{severity} {damage_type} on {view_lower}")
+            max_severity = max(max_severity, severity_rank.get(severity, 1))
+    
+    severity = _SEVERITY_LABELS[max_severity]
+    
+    return {
+        "overall": overall,
+        "issues": all_issues[:3],  # Top 3 issues only
+        "severity": severity
+    }
+
 
 def retry_with_backoff(max_retries=3, base_delay=2):
-    """Decorator for exponential backoff retry"""
+    """Decorator for exponential backoff retry on RateLimitError"""
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
+                except RateLimitError as e:
                     if attempt == max_retries - 1:
                         raise
                     
-                    # Check if it's a rate limit error
-                    if "429" in str(e) or "rate limit" in str(e).lower():
-                        delay = base_delay * (2 ** attempt)
-                        print(f"⏳ Rate limit hit. Waiting {delay}s before retry {attempt + 1}/{max_retries}...")
-                        time.sleep(delay)
-                    else:
-                        raise
+                    delay = max(base_delay * (2 ** attempt), e.retry_after or 0)
+                    logger.debug("Rate limit hit, retrying in %ss (%d/%d)", delay, attempt + 1, max_retries)
+                    time.sleep(delay)
             return None
         return wrapper
     return decorator
@@ -38,35 +197,41 @@ class BilingualReportGenerator:
     """
     
     def __init__(self):
-        load_dotenv()
         self.google_key = os.getenv("GOOGLE_API_KEY")
         self.model_id = "gemini-2.0-flash-exp"
         self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model_id}:generateContent?key={self.google_key}"
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # Minimum 1 second between requests
-
-    def _rate_limit_wait(self):
-        """Ensure minimum time between API requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        self.stream_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model_id}:streamGenerateContent?alt=sse&key={self.google_key}"
+        # Gemini allows 60 requests/minute; keep headroom and cap bursts so
+        # no rolling minute exceeds the quota
+        self._rate_limiter = TokenBucket(max_rate=55, period=60, burst=5)
+        self._session = create_session()
+        self._session.headers.update({"Content-Type": "application/json"})
+        # Successful reports keyed on a hash of the generated prompt
+        self._report_cache = TTLCache(maxsize=256, ttl=3600)
+        # Concurrent requests for the same prompt share one Gemini call
+        self._inflight = SingleFlight()
+        # Skip the LLM for clean devices with unremarkable pricing
+        self.template_shortcut = True
+    
+    def close(self):
+        """Release pooled connections"""
+        self._session.close()
 
     @retry_with_backoff(max_retries=3, base_delay=2)
-    def _call_gemini_api(self, payload: Dict) -> Optional[Dict]:
-        """Make API call with rate limiting and retry logic"""
-        self._rate_limit_wait()
+    def _call_gemini_api(self, body: bytes) -> Optional[Dict]:
+        """Make API call with rate limiting and retry logic (body is pre-serialized JSON)"""
+        self._rate_limiter.acquire()
         
-        response = requests.post(self.api_url, json=payload, timeout=30)
+        response = self._session.post(self.api_url, data=body, timeout=(3, 30))
         
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         elif response.status_code == 429:
-            raise Exception("Rate limit exceeded (429)")
+            retry_after = response.headers.get('Retry-After')
+            raise RateLimitError(
+                "Rate limit exceeded (429)",
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
         else:
             raise Exception(f"API Error: {response.status_code} - {response.text}")
 
@@ -89,6 +254,114 @@ class BilingualReportGenerator:
         Returns:
             {"english": str, "arabic": str, "full_text": str}
         """
+        prompt, fallback_args = self._prepare_report(
+            product_specs, cv_data, pricing_data, search_details
+        )
+        
+        if self._template_sufficient(cv_data, *fallback_args):
+            return self._generate_template_report(*fallback_args)
+        
+        cache_key = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).hexdigest()
+        cached = self._report_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Report cache hit (%s)", self._report_cache.stats())
+            return dict(cached)
+
+        # Serialized once, reused across retry attempts
+        body = orjson.dumps(self._build_payload(prompt))
+        
+        try:
+            result = self._inflight.do(cache_key, lambda: self._call_gemini_api(body))
+            
+            if result:
+                full_text = result['candidates'][0]['content']['parts'][0]['text']
+                report = self._build_report(full_text)
+                self._report_cache.set(cache_key, report)
+                return dict(report)
+                
+        except Exception:
+            logger.exception("Report generation failed")
+        
+        # Fallback to template-based report
+        logger.debug("Using fallback report template")
+        return self._generate_fallback_report(*fallback_args)
+
+    def iter_complete_report(
+        self, 
+        product_specs: Dict, 
+        cv_data: Dict, 
+        pricing_data: Dict, 
+        search_details: Dict = None
+    ) -> Iterator[Tuple[str, object]]:
+        """
+        Streaming version of generate_complete_report.
+        Text is yielded as Gemini produces it, so the UI can render the report
+        before the full response is ready.
+        
+        Yields:
+            ("delta", str) for each text chunk
+            ("complete", <same dict generate_complete_report returns>)
+        """
+        prompt, fallback_args = self._prepare_report(
+            product_specs, cv_data, pricing_data, search_details
+        )
+        
+        if self._template_sufficient(cv_data, *fallback_args):
+            yield 'complete', self._generate_template_report(*fallback_args)
+            return
+        
+        cache_key = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).hexdigest()
+        cached = self._report_cache.get(cache_key)
+        if cached is not None:
+            yield 'complete', dict(cached)
+            return
+        
+        try:
+            chunks = []
+            for text in self._stream_gemini_api(self._build_payload(prompt)):
+                chunks.append(text)
+                yield 'delta', text
+            
+            if chunks:
+                report = self._build_report(''.join(chunks))
+                self._report_cache.set(cache_key, report)
+                yield 'complete', dict(report)
+                return
+                
+        except Exception:
+            logger.exception("Streaming report generation failed")
+        
+        logger.debug("Using fallback report template")
+        yield 'complete', self._generate_fallback_report(*fallback_args)
+
+    def _stream_gemini_api(self, payload: Dict) -> Iterator[str]:
+        """Call streamGenerateContent (SSE) and yield text parts as they arrive"""
+        self._rate_limiter.acquire()
+        
+        with self._session.post(
+            self.stream_url, data=orjson.dumps(payload), timeout=(3, 30), stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"API Error: {response.status_code} - {response.text}")
+            
+            for line in response.iter_lines():
+                if not line.startswith(b'data:'):
+                    continue
+                
+                chunk = orjson.loads(line[5:])
+                for candidate in chunk.get('candidates', []):
+                    for part in candidate.get('content', {}).get('parts', []):
+                        if part.get('text'):
+                            yield part['text']
+
+    def _prepare_report(
+        self, 
+        product_specs: Dict, 
+        cv_data: Dict, 
+        pricing_data: Dict, 
+        search_details: Dict = None
+    ) -> Tuple[str, tuple]:
+        """Build the Gemini prompt and the matching fallback-report arguments"""
         # Extract key information
         product_name = product_specs.get('product_name', 'Device')
         usage_years = cv_data.get('usage_years', 1.0)
@@ -117,37 +390,86 @@ class BilingualReportGenerator:
             specs=product_specs.get('specifications', {}),
             market_price=market_price
         )
+        
+        fallback_args = (
+            product_name, condition_summary, new_price, used_price, discount, market_price
+        )
+        return prompt, fallback_args
 
-        payload = {
+    def _template_sufficient(
+        self,
+        cv_data: Dict,
+        product_name: str,
+        condition_summary: Dict,
+        new_price: float,
+        used_price: float,
+        discount: float,
+        market_price: Optional[float] = None
+    ) -> bool:
+        """
+        True when the template report says everything an LLM report would:
+        no detected damage, price in line with the market, and a discount
+        inside the expected range for the condition.
+        
+        Damage is checked on the evaluator output (detected_issues /
+        issues_count) as well as on analysis_results, since the CV
+        integration service only passes the former.
+        """
+        if not self.template_shortcut or not new_price or condition_summary['issues']:
+            return False
+        
+        if cv_data.get('detected_issues') or cv_data.get('issues_count'):
+            return False
+        
+        if market_price and market_price > 0:
+            if abs(market_price - used_price) / market_price * 100 >= 5:
+                return False
+        
+        return validate_pricing_logic(
+            used_price=used_price,
+            new_price=new_price,
+            market_price=market_price,
+            condition=condition_summary['overall']
+        )['valid']
+
+    def _generate_template_report(self, *fallback_args) -> Dict:
+        report = self._generate_fallback_report(*fallback_args)
+        report["status"] = "template_sufficient"
+        return report
+
+    @staticmethod
+    def _build_payload(prompt: str) -> Dict:
+        return {
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": {
                 "temperature": 0.7,
                 "maxOutputTokens": 1000
             }
         }
+
+    def _build_report(self, full_text: str) -> Dict:
+        en_report, ar_report = self._split_bilingual_report(full_text)
+        return {
+            "english": en_report.strip(),
+            "arabic": ar_report.strip(),
+            "full_text": full_text,
+            "status": "success"
+        }
+
+    def generate_reports_batch(self, items: List[Dict], max_workers: int = 4) -> List[Dict]:
+        """
+        Generate reports for several products concurrently.
         
-        try:
-            result = self._call_gemini_api(payload)
-            
-            if result:
-                full_text = result['candidates'][0]['content']['parts'][0]['text']
-                en_report, ar_report = self._split_bilingual_report(full_text)
-                
-                return {
-                    "english": en_report.strip(),
-                    "arabic": ar_report.strip(),
-                    "full_text": full_text,
-                    "status": "success"
-                }
-                
-        except Exception as e:
-            print(f"❌ Report Generation Error: {str(e)}")
+        Each item holds the generate_complete_report keyword arguments
+        (product_specs, cv_data, pricing_data and optionally search_details).
+        Gemini round-trips overlap while the rate limiter still caps the
+        request rate. Results are returned in input order.
+        """
+        if not items:
+            return []
         
-        # Fallback to template-based report
-        print("⚠️ Using fallback report template")
-        return self._generate_fallback_report(
-            product_name, condition_summary, new_price, used_price, discount, market_price
-        )
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(lambda item: self.generate_complete_report(**item), items))
 
     def _extract_condition_from_cv(self, analysis_results: Dict) -> Dict:
         """
@@ -174,42 +496,12 @@ class BilingualReportGenerator:
                 "severity": "none"
             }
         
-        # Collect all conditions
-        conditions = []
-        all_issues = []
-        
-        for view, analysis in analysis_results.items():
-            condition = analysis.get('overall_condition', 'good').lower()
-            conditions.append(condition)
-            
-            # Extract damage details
-            damage_details = analysis.get('damage_details', {})
-            
-            for damage_type, items in damage_details.items():
-                if items and len(items) > 0:
-                    severity = items[0].get('severity', 'minor') if isinstance(items, list) else 'minor'
-                    all_issues.append(f"{severity} {damage_type} on {view.lower()}")
-        
-        # Determine overall condition (worst case)
-        condition_priority = {"poor": 0, "fair": 1, "good": 2, "excellent": 3}
-        overall = min(conditions, key=lambda c: condition_priority.get(c, 2))
-        
-        # Determine severity
-        if any("severe" in issue or "major" in issue for issue in all_issues):
-            severity = "severe"
-        elif any("moderate" in issue for issue in all_issues):
-            severity = "moderate"
-        elif all_issues:
-            severity = "minor"
-        else:
-            severity = "none"
-        
-        return {
-            "overall": overall,
-            "issues": all_issues[:3],  # Top 3 issues only
-            "severity": severity
-        }
-
+        # Reports for the same device (reruns, retries, streaming and plain
+        # paths) share one summary; keys are not sorted so issue order holds
+        payload_key = orjson.dumps(analysis_results)
+        summary = _extract_condition_cached(payload_key)
+        return {**summary, "issues": list(summary["issues"])}
+    
     def _build_focused_prompt(
         self, 
         product_name: str,
@@ -225,14 +517,13 @@ class BilingualReportGenerator:
         Build a focused prompt for ONE paragraph report.
         """
         # Format specs (top 3-4 only)
-        key_specs = ['display', 'processor', 'ram', 'storage', 'battery', 'camera']
-        specs_text = ""
-        for key in key_specs:
-            if key in specs:
-                specs_text += f"- {key.title()}: {specs[key]}\n"
+        specs_text = "".join(
+            f"- {label}: {specs[key]}\n"
+            for key, label in _KEY_SPECS
+            if key in specs
+        )
         
         # Format issues
-        issues_text = ""
         if condition_summary['issues']:
             issues_text = "\n".join(f"• {issue}" for issue in condition_summary['issues'])
         else:
@@ -243,66 +534,47 @@ class BilingualReportGenerator:
         if market_price and market_price > 0:
             price_diff = ((market_price - used_price) / market_price) * 100
             if abs(price_diff) > 5:  # Only mention if significant difference
-                market_context = f"\nMARKET COMPARISON:\n• Similar devices selling at: EGP {market_price:,.2f}\n• Price advantage: {abs(price_diff):.0f}% {'lower' if used_price < market_price else 'higher'}\n"
+                market_context = _MARKET_CONTEXT_TEMPLATE.format(
+                    market_price=market_price,
+                    price_diff=abs(price_diff),
+                    direction='lower' if used_price < market_price else 'higher'
+                )
+        
+        if market_price:
+            pricing_task = f"Compares to market pricing (EGP {market_price:,.2f})"
+        else:
+            pricing_task = "Justifies the discount percentage"
         
-        prompt = f"""You are a professional tech product evaluator writing a pricing justification report.
-
-PRODUCT: {product_name}
-USAGE: {usage_years} year(s)
-CONDITION: {condition_summary['overall'].upper()}
-
-INSPECTION RESULTS:
-{issues_text}
-
-KEY SPECIFICATIONS:
-{specs_text if specs_text else "Standard specifications for this model"}
-{market_context}
-PRICING:
-• Original New Price: EGP {new_price:,.2f}
-• Fair Used Price: EGP {used_price:,.2f}
-• Discount: {discount:.0f}%
-
-INSTRUCTIONS:
-Write EXACTLY ONE professional paragraph (5-6 sentences) that:
-1. Opens with device name, usage period, and verified condition
-2. References 2-3 key specifications that retain value
-3. Honestly describes condition impact on pricing (mention issues if present)
-4. {f'Compares to market pricing (EGP {market_price:,.2f})' if market_price else 'Justifies the discount percentage'}
-5. Concludes with final price and value proposition
-
-CRITICAL REQUIREMENTS:
-- Be honest about condition issues
-- Justify price based on actual inspection results
-- Use professional but accessible language
-- Keep it concise (one paragraph only)
-
-Format your response EXACTLY as:
-
-[ENGLISH]
-Your English paragraph here (5-6 sentences, professional tone)
-
-[ARABIC]
-الفقرة بالعربية هنا (5-6 جمل، لغة احترافية)
-
-Note: Arabic translation must be natural and professional, not literal word-for-word translation."""
+        prompt = _FOCUSED_PROMPT_TEMPLATE.format(
+            product_name=product_name,
+            usage_years=usage_years,
+            condition=condition_summary['overall'].upper(),
+            issues_text=issues_text,
+            specs_text=specs_text or "Standard specifications for this model",
+            market_context=market_context,
+            new_price=new_price,
+            used_price=used_price,
+            discount=discount,
+            pricing_task=pricing_task
+        )
         
         return prompt
 
     def _split_bilingual_report(self, text: str) -> tuple[str, str]:
         """Extract English and Arabic sections from generated text"""
         # Try to find marked sections
-        en_match = re.search(r'\[ENGLISH\](.*?)(?=\[ARABIC\]|$)', text, re.DOTALL | re.IGNORECASE)
-        ar_match = re.search(r'\[ARABIC\](.*?)$', text, re.DOTALL | re.IGNORECASE)
+        en_match = _ENGLISH_SECTION_RE.search(text)
+        ar_match = _ARABIC_SECTION_RE.search(text)
         
         if en_match and ar_match:
             return en_match.group(1).strip(), ar_match.group(1).strip()
         
         # Fallback: split by paragraph breaks
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        paragraphs = [p for p in map(str.strip, text.split('\n\n')) if p]
         
         if len(paragraphs) >= 2:
             # Detect which is Arabic by checking for Arabic characters
-            if any('\u0600' <= c <= '\u06FF' for c in paragraphs[0]):
+            if _ARABIC_CHAR_RE.search(paragraphs[0]):
                 return paragraphs[1], paragraphs[0]
             else:
                 return paragraphs[0], paragraphs[1]
@@ -323,12 +595,7 @@ Note: Arabic translation must be natural and professional, not literal word-for-
         Enhanced template-based fallback if API fails.
         """
         condition = condition_summary.get('overall', 'good')
-        condition_ar = {
-            'excellent': 'ممتازة',
-            'good': 'جيدة',
-            'fair': 'مقبولة',
-            'poor': 'ضعيفة'
-        }.get(condition, 'جيدة')
+        condition_ar = _CONDITION_AR.get(condition, 'جيدة')
         
         issues = condition_summary.get('issues', [])
         
@@ -348,10 +615,8 @@ Note: Arabic translation must be natural and professional, not literal word-for-
             else:
                 en_report += f"Pricing reflects the verified condition and market standards (similar devices: EGP {market_price:,.2f}). "
         
-        en_report += (
-            f"Based on the inspection results and current condition, the fair market price is EGP {used_price:,.2f}, "
-            f"which represents a {discount:.0f}% discount from the original retail price of EGP {new_price:,.2f}. "
-            f"This pricing ensures fair value for both buyers and sellers based on actual device condition."
+        en_report += _FALLBACK_PRICE_EN.format(
+            used_price=used_price, discount=discount, new_price=new_price
         )
         
         # Arabic report (professional translation)
@@ -369,10 +634,8 @@ Note: Arabic translation must be natural and professional, not literal word-for-
             else:
                 ar_report += f"السعر يعكس الحالة المؤكدة ومعايير السوق (أجهزة مماثلة: {market_price:,.2f} جنيه). "
         
-        ar_report += (
-            f"بناءً على نتائج الفحص والحالة الحالية، السعر العادل في السوق هو {used_price:,.2f} جنيه مصري، "
-            f"مما يمثل خصم {discount:.0f}٪ من سعر البيع الأصلي البالغ {new_price:,.2f} جنيه مصري. "
-            f"يضمن هذا السعر قيمة عادلة للمشترين والبائعين بناءً على حالة الجهاز الفعلية."
+        ar_report += _FALLBACK_PRICE_AR.format(
+            used_price=used_price, discount=discount, new_price=new_price
         )
         
         return {
@@ -383,6 +646,12 @@ Note: Arabic translation must be natural and professional, not literal word-for-
         }
 
 
+@lru_cache(maxsize=1)
+def get_bilingual_generator() -> BilingualReportGenerator:
+    """Process-wide generator, so the session, caches and rate limiter are shared"""
+    return BilingualReportGenerator()
+
+
 # ============================================
 # HELPER FUNCTIONS FOR INTEGRATION
 # ============================================
@@ -396,16 +665,10 @@ def format_condition_for_display(analysis_results: Dict) -> str:
         return "No inspection data available"
     
     lines = []
-    for view, analysis in analysis_results.items():
-        condition = analysis.get('overall_condition', 'unknown').upper()
+    for view, condition, damages in _walk_analysis(orjson.dumps(analysis_results)):
+        condition = ('unknown' if condition is None else condition).upper()
         lines.append(f"**{view}:** {condition}")
-        
-        damage = analysis.get('damage_details', {})
-        if damage:
-            for damage_type, items in damage.items():
-                if items and len(items) > 0:
-                    count = len(items) if isinstance(items, list) else 1
-                    lines.append(f"  - {count} {damage_type}")
+        lines.extend(f"  - {count} {damage_type}" for damage_type, _severity, count in damages)
     
     return "\n".join(lines)
 
@@ -440,15 +703,8 @@ def validate_pricing_logic(
             warnings.append(f"⚠️ Price {price_diff_pct:.0f}% lower than market average - check calculation")
     
     # Condition-based validation
-    expected_discount_range = {
-        'excellent': (15, 35),
-        'good': (30, 50),
-        'fair': (50, 70),
-        'poor': (70, 85)
-    }
-    
-    if condition in expected_discount_range:
-        min_d, max_d = expected_discount_range[condition]
+    if condition in _EXPECTED_DISCOUNT_RANGE:
+        min_d, max_d = _EXPECTED_DISCOUNT_RANGE[condition]
         if discount < min_d or discount > max_d:
             warnings.append(f"⚠️ Discount ({discount:.0f}%) unusual for {condition} condition (expected {min_d}-{max_d}%)")
     
@@ -456,4 +712,51 @@ def validate_pricing_logic(
         "valid": len(warnings) == 0,
         "warnings": warnings,
         "discount": discount
+    }
+
+
+def validate_pricing_logic_batch(used_prices, new_prices, market_prices=None, conditions=None) -> Dict:
+    """
+    Vectorized validate_pricing_logic for catalog-wide checks.
+    
+    Takes equal-length array-likes; missing market prices may be 0 or NaN and
+    conditions default to "good". Returns numpy arrays: 'valid', 'discount'
+    and one boolean flag per warning rule. Use validate_pricing_logic for the
+    warning messages of individual rows.
+    """
+    used_prices = np.asarray(used_prices, dtype=np.float64)
+    new_prices = np.asarray(new_prices, dtype=np.float64)
+    discount = (new_prices - used_prices) / new_prices * 100
+    
+    discount_too_low = discount < 10
+    discount_too_high = discount > 80
+    
+    if market_prices is None:
+        above_market = below_market = np.zeros(used_prices.shape, dtype=bool)
+    else:
+        market_prices = np.asarray(market_prices, dtype=np.float64)
+        has_market = market_prices > 0
+        above_market = has_market & (used_prices > market_prices * 1.3)
+        below_market = has_market & ~above_market & (used_prices < market_prices * 0.5)
+    
+    # Look each distinct condition up once; unknown labels are never unusual
+    labels, inverse = np.unique(
+        np.asarray(["good"] * used_prices.size if conditions is None else conditions, dtype=str),
+        return_inverse=True
+    )
+    bounds = np.array(
+        [_EXPECTED_DISCOUNT_RANGE.get(label, (-np.inf, np.inf)) for label in labels], dtype=np.float64
+    ).reshape(-1, 2)
+    min_d = bounds[inverse.reshape(used_prices.shape), 0]
+    max_d = bounds[inverse.reshape(used_prices.shape), 1]
+    unusual_for_condition = (discount < min_d) | (discount > max_d)
+    
+    return {
+        "valid": ~(discount_too_low | discount_too_high | above_market | below_market | unusual_for_condition),
+        "discount": discount,
+        "discount_too_low": discount_too_low,
+        "discount_too_high": discount_too_high,
+        "above_market": above_market,
+        "below_market": below_market,
+        "unusual_for_condition": unusual_for_condition
     }
\ No newline at end of file
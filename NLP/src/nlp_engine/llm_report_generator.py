@@ -1,6 +1,26 @@
-import requests
-import json
+import hashlib
+import logging
+from functools import lru_cache
+import orjson
 from typing import Dict
+from src.utils.http import create_session
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Invariant instructions, sent as a cacheable system prefix
+REPORT_INSTRUCTIONS = """Generate a professional pricing report for a used product listing.
+
+TASK:
+Write a professional, customer-friendly report (3-4 paragraphs) that:
+1. Describes the product condition honestly
+2. Explains the pricing logic clearly
+3. Highlights the value proposition
+4. Builds buyer confidence
+
+Use a warm, trustworthy tone. Be specific about the condition issues but emphasize the fair pricing.
+Write in English. Format with markdown.
+"""
 
 class LLMReportGenerator:
     """
@@ -11,6 +31,14 @@ class LLMReportGenerator:
     def __init__(self):
         self.api_url = "https://api.anthropic.com/v1/messages"
         # API key handled by claude.ai environment
+        self._session = create_session()
+        self._session.headers.update({"Content-Type": "application/json"})
+        # Generated reports keyed on a hash of the prompt
+        self._report_cache = TTLCache(maxsize=256, ttl=3600)
+    
+    def close(self):
+        """Release pooled connections"""
+        self._session.close()
         
     def generate_pricing_report(self, cv_data: Dict, pricing_data: Dict, search_details: Dict = None) -> str:
         """
@@ -27,30 +55,48 @@ class LLMReportGenerator:
         
         prompt = self._build_prompt(cv_data, pricing_data, search_details)
         
+        cache_key = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).hexdigest()
+        cached = self._report_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Report cache hit (%s)", self._report_cache.stats())
+            return cached
+        
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.api_url,
-                headers={"Content-Type": "application/json"},
-                json={
+                data=orjson.dumps({
                     "model": "claude-sonnet-4-20250514",
                     "max_tokens": 1000,
+                    "system": [{
+                        "type": "text",
+                        "text": REPORT_INSTRUCTIONS,
+                        "cache_control": {"type": "ephemeral"}
+                    }],
                     "messages": [{"role": "user", "content": prompt}]
-                },
-                timeout=30
+                }),
+                timeout=(3, 30)
             )
             
             if response.status_code == 200:
-                data = response.json()
-                return data['content'][0]['text']
+                data = orjson.loads(response.content)
+                usage = data.get('usage', {})
+                logger.debug(
+                    "Prompt cache: read=%s created=%s",
+                    usage.get('cache_read_input_tokens', 0),
+                    usage.get('cache_creation_input_tokens', 0)
+                )
+                report = data['content'][0]['text']
+                self._report_cache.set(cache_key, report)
+                return report
             else:
                 return self._generate_fallback_report(cv_data, pricing_data)
                 
         except Exception as e:
-            print(f"LLM Error: {e}")
+            logger.warning("LLM Error: %s", e)
             return self._generate_fallback_report(cv_data, pricing_data)
     
     def _build_prompt(self, cv_data: Dict, pricing_data: Dict, search_details: Dict = None) -> str:
-        """Build comprehensive prompt for Claude"""
+        """Build the per-product part of the prompt (instructions go in REPORT_INSTRUCTIONS)"""
         
         brand = pricing_data['price_metadata']['brand']
         model = pricing_data['price_metadata']['model']
@@ -63,9 +109,7 @@ class LLMReportGenerator:
         discount = pricing_data['discount_percentage']
         source = pricing_data['price_metadata']['source']
         
-        prompt = f"""Generate a professional pricing report for a used product listing.
-
-PRODUCT INFORMATION:
+        prompt = f"""PRODUCT INFORMATION:
 - Brand: {brand}
 - Model: {model}
 - Condition: {condition} ({condition_score}/10)
@@ -96,18 +140,6 @@ MARKET RESEARCH:
                 best = search_details['best_deal']
                 prompt += f"- Best Deal: {best['store']} at EGP {best['price']:,.2f}\n"
         
-        prompt += """
-TASK:
-Write a professional, customer-friendly report (3-4 paragraphs) that:
-1. Describes the product condition honestly
-2. Explains the pricing logic clearly
-3. Highlights the value proposition
-4. Builds buyer confidence
-
-Use a warm, trustworthy tone. Be specific about the condition issues but emphasize the fair pricing.
-Write in English. Format with markdown.
-"""
-        
         return prompt
     
     def _generate_fallback_report(self, cv_data: Dict, pricing_data: Dict) -> str:
@@ -147,4 +179,10 @@ This pricing reflects the actual condition of the device, ensuring you get a fai
 This is a solid opportunity for buyers looking for {brand} products at competitive prices.
 """
         
-        return report
\ No newline at end of file
+        return report
+
+
+@lru_cache(maxsize=1)
+def get_llm_generator() -> LLMReportGenerator:
+    """Process-wide generator, so the session and report cache are shared"""
+    return LLMReportGenerator()
@@ -1,49 +1,81 @@
 import random
+from bisect import bisect_right
 from src.utils.config import Config
 
+_DEFAULT_OPENING = 'This item is in good condition.'
+
+# Bound on memoized issue descriptions per TemplateManager
+_MAX_CACHED_DESCRIPTIONS = 1024
+
 class TemplateManager:
     """Manage text templates and phrase generation"""
     
     def __init__(self):
         self.templates = Config.load_templates()
+        
+        # Sections used on every call, bound once
+        self._openings = {
+            condition: data.get('opening', _DEFAULT_OPENING)
+            for condition, data in self.templates['condition_descriptors'].items()
+        }
+        self._issue_phrases = self.templates['issue_phrases']
+        self._location_phrases = self.templates['location_phrases']
+        self._transitions = tuple(self.templates['transition_phrases'])
+        self._closings = tuple(self.templates['positive_closings'])
+        
+        # Discount ranges sorted by lower bound, for bisect lookups
+        self._discount_table = sorted(
+            (data['range'][0], data['range'][1], data['phrase'])
+            for data in self.templates['discount_explanations'].values()
+        )
+        self._discount_mins = [row[0] for row in self._discount_table]
+        
+        # (type, severity, location) -> formatted description
+        self._issue_descriptions = {}
     
     def get_condition_opening(self, condition):
         """Get opening statement based on overall condition"""
-        condition_data = self.templates['condition_descriptors'].get(condition, {})
-        return condition_data.get('opening', 'This item is in good condition.')
+        return self._openings.get(condition, _DEFAULT_OPENING)
     
     def get_issue_phrase(self, issue_type, severity):
         """Get phrase for specific issue type and severity"""
-        issue_phrases = self.templates['issue_phrases'].get(issue_type, {})
+        issue_phrases = self._issue_phrases.get(issue_type, {})
         return issue_phrases.get(severity, f"{severity} {issue_type}")
     
     def get_location_phrase(self, location):
         """Get phrase for issue location"""
-        return self.templates['location_phrases'].get(location, f"on the {location}")
+        return self._location_phrases.get(location, f"on the {location}")
     
     def get_discount_explanation(self, discount_percentage):
         """Get explanation phrase based on discount level"""
-        for level, data in self.templates['discount_explanations'].items():
-            min_discount, max_discount = data['range']
-            if min_discount <= discount_percentage <= max_discount:
-                return data['phrase']
+        idx = bisect_right(self._discount_mins, discount_percentage) - 1
+        if idx >= 0:
+            _, max_discount, phrase = self._discount_table[idx]
+            if discount_percentage <= max_discount:
+                return phrase
         
         return "The condition is reflected in the pricing"
     
     def get_transition_phrase(self):
         """Get random transition phrase for better flow"""
-        return random.choice(self.templates['transition_phrases'])
+        return random.choice(self._transitions)
     
     def get_positive_closing(self):
         """Get positive closing statement"""
-        return random.choice(self.templates['positive_closings'])
+        return random.choice(self._closings)
     
     def format_issue_description(self, issue):
         """Format a single issue into natural language"""
-        issue_phrase = self.get_issue_phrase(issue['type'], issue['severity'])
-        location_phrase = self.get_location_phrase(issue['location'])
+        key = (issue['type'], issue['severity'], issue['location'])
+        description = self._issue_descriptions.get(key)
+        if description is None:
+            issue_phrase = self.get_issue_phrase(key[0], key[1])
+            location_phrase = self.get_location_phrase(key[2])
+            description = f"{issue_phrase} {location_phrase}"
+            if len(self._issue_descriptions) < _MAX_CACHED_DESCRIPTIONS:
+                self._issue_descriptions[key] = description
         
-        return f"{issue_phrase} {location_phrase}"
+        return description
     
     def format_multiple_issues(self, issues):
         """Format multiple issues into a coherent sentence"""
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class DiscountExplainer:
     """Explain discount breakdown in detail"""
     
@@ -7,18 +10,12 @@ class DiscountExplainer:
         condition_adj = price_factors.get('condition_adjustment', 0)
         issue_penalty = price_factors.get('issue_penalty', 0)
         
-        breakdown = []
-        
-        if base_dep > 0:
-            breakdown.append(f"{base_dep}% from overall condition score")
-        
-        if condition_adj > 0:
-            breakdown.append(f"{condition_adj}% from condition category")
-        
-        if issue_penalty > 0:
-            breakdown.append(f"{round(issue_penalty, 1)}% from detected issues")
-        
-        return breakdown
+        factors = (
+            (base_dep, base_dep, "from overall condition score"),
+            (condition_adj, condition_adj, "from condition category"),
+            (issue_penalty, round(issue_penalty, 1), "from detected issues")
+        )
+        return [f"{shown}% {label}" for value, shown, label in factors if value > 0]
     
     def generate_breakdown_text(self, price_factors, total_discount):
         """Generate human-readable breakdown text"""
@@ -27,11 +24,7 @@ class DiscountExplainer:
         if not breakdown_items:
             return "No discount factors applied."
         
-        text = f"The {total_discount}% discount consists of: "
-        text += ", ".join(breakdown_items)
-        text += "."
-        
-        return text
+        return f"The {total_discount}% discount consists of: {', '.join(breakdown_items)}."
     
     def compare_to_market(self, used_price, market_average=None):
         """Compare price to market average"""
@@ -47,6 +40,30 @@ class DiscountExplainer:
         else:
             return "This price is competitive with market average"
     
+    def compare_to_market_batch(self, used_prices, market_average):
+        """
+        Compare an array of prices to one market average (same messages as
+        compare_to_market). Returns None when there is no market average.
+        """
+        if market_average is None:
+            return None
+        if market_average == 0:
+            # compare_to_market divides by it too
+            raise ZeroDivisionError("market_average must be non-zero")
+        
+        used_prices = np.asarray(used_prices, dtype=float)
+        difference = (used_prices - market_average) / market_average * 100.0
+        below = difference < -10
+        above = difference > 10
+        
+        result = np.empty(used_prices.shape, dtype=object)
+        result[below] = [f"This price is {value}% below market average"
+                         for value in np.abs(np.round(difference[below])).astype(int)]
+        result[above] = [f"This price is {value}% above market average"
+                         for value in np.round(difference[above]).astype(int)]
+        result[~(below | above)] = "This price is competitive with market average"
+        return result
+    
     def get_value_proposition(self, discount_percentage):
         """Get value proposition statement based on discount level"""
         if discount_percentage < 15:
@@ -1,7 +1,50 @@
 import os
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
 from src.external.price_search import PriceSearchEngine
 from src.external.price_cache import PriceCache
 from src.external.price_database import PriceDatabase
+from src.utils.single_flight import SingleFlight
+from src.utils.ttl_cache import TTLCache
+
+# Usage depreciation (%): under 0.5y, under 1y, under 2y, under 3y, 3y+
+_USAGE_THRESHOLDS = (0.5, 1.0, 2.0, 3.0)
+_USAGE_DEPRECIATION = (10.0, 15.0, 25.0, 35.0, 45.0)
+_USAGE_THRESHOLDS_ARRAY = np.array(_USAGE_THRESHOLDS)
+_USAGE_DEPRECIATION_ARRAY = np.array(_USAGE_DEPRECIATION)
+
+# Depreciation (%) per overall condition label
+_CONDITION_DEPRECIATION = MappingProxyType({
+    'excellent': 0.0,
+    'very good': 2.0,
+    'good': 5.0,
+    'fair': 10.0,
+    'poor': 15.0,
+    'damaged': 20.0,
+    'broken': 30.0
+})
+
+# Damage depreciation (%) per issue severity, used when the CV output has no
+# precomputed total_discount_impact
+_SEVERITY_DEPRECIATION = MappingProxyType({
+    'minor': 2.0, 'moderate': 5.0, 'severe': 10.0, 'critical': 15.0
+})
+_MAX_ISSUE_DEPRECIATION = 25.0
+
+# discount_breakdown keys and their wording in get_price_explanation
+_BREAKDOWN_LABELS = (
+    ('usage', 'age'),
+    ('condition', 'condition'),
+    ('damage', 'physical damage')
+)
+
+@lru_cache(maxsize=4096)
+def _reference_key(brand, model, category):
+    """Normalized reference-cache key (memoized: the same SKUs are priced repeatedly)"""
+    return (brand.strip().lower(), model.strip().lower(), (category or '').strip().lower())
 
 class PriceCalculator:
     """
@@ -12,7 +55,14 @@ class PriceCalculator:
     def __init__(self, use_web_search=True, serpapi_key=None):
         self.use_web_search = use_web_search
         self.price_db = PriceDatabase()
+        # Resolved reference prices for hot products; short TTL bounds staleness
+        self._reference_cache = TTLCache(maxsize=2048, ttl=300)
+        # Concurrent misses on the same product share one lookup/web search
+        self._inflight = SingleFlight()
         
+        # Web search and its cache only exist when use_web_search is set
+        self.price_search = None
+        self.price_cache = None
         if use_web_search:
             api_key = serpapi_key or os.getenv('SERPAPI_KEY')
             self.price_search = PriceSearchEngine(api_key=api_key)
@@ -33,6 +83,59 @@ class PriceCalculator:
         else:
             price_source = 'manual'
         
+        return self._price_from_reference(brand, model, cv_data, reference_price, price_source)
+    
+    def calculate_used_prices_batch(self, items, max_workers=8):
+        """
+        Price several products at once.
+        
+        Each item is a dict with 'brand', 'model', 'cv_data' and optionally
+        'category'. Reference prices are resolved in bulk: database first,
+        then one cache pass over the misses, then the remaining web searches
+        run concurrently. Returns results (None when no price) in input order.
+        """
+        keys = [(item['brand'], item['model'], item.get('category')) for item in items]
+        references = self._get_reference_prices_batch(keys, max_workers)
+        
+        return [
+            self._price_from_reference(
+                item['brand'], item['model'], item['cv_data'],
+                reference['price'], reference.get('source', 'unknown')
+            ) if reference and reference.get('price') is not None else None
+            for item, reference in zip(items, references)
+        ]
+    
+    def calculate_used_prices_array(
+        self, reference_prices, usage_years, condition_depreciation, damage_depreciation
+    ):
+        """
+        Vectorized pricing arithmetic for large sweeps.
+        
+        Takes array-likes of equal length: reference prices, usage years and
+        the condition/damage depreciation percentages (see
+        _calculate_condition_depreciation/_calculate_damage_depreciation).
+        Applies the same usage table and 85% cap as calculate_used_price.
+        
+        Returns:
+            (used_prices, discount_percentages) as numpy arrays, rounded to 2 dp
+        """
+        reference_prices = np.asarray(reference_prices, dtype=np.float64)
+        usage_depreciation = _USAGE_DEPRECIATION_ARRAY[
+            np.searchsorted(_USAGE_THRESHOLDS_ARRAY, np.asarray(usage_years, dtype=np.float64), side='right')
+        ]
+        
+        total = np.minimum(
+            usage_depreciation
+            + np.asarray(condition_depreciation, dtype=np.float64)
+            + np.asarray(damage_depreciation, dtype=np.float64),
+            85.0
+        )
+        used_prices = np.round(reference_prices * (1.0 - total * 0.01), 2)
+        
+        return used_prices, np.round(total, 2)
+    
+    def _price_from_reference(self, brand, model, cv_data, reference_price, price_source):
+        """Apply depreciation to a known reference price"""
         # Calculate depreciation components
         usage_depreciation = self._calculate_usage_depreciation(cv_data)
         condition_depreciation = self._calculate_condition_depreciation(cv_data)
@@ -67,7 +170,26 @@ class PriceCalculator:
             }
         }
     
+    def clear_reference_cache(self):
+        """Forget memoized reference prices (e.g. after editing the database)"""
+        self._reference_cache.clear()
+    
     def _get_reference_price(self, brand, model, category):
+        """
+        Get reference price, memoized in-process per normalized product.
+        Concurrent misses for the same product are coalesced.
+        """
+        key = _reference_key(brand, model, category)
+        reference = self._reference_cache.get(key)
+        if reference is None:
+            reference = self._inflight.do(
+                key, lambda: self._lookup_reference_price(brand, model, category)
+            )
+            if reference:
+                self._reference_cache.set(key, reference)
+        return reference
+    
+    def _lookup_reference_price(self, brand, model, category):
         """
         Get reference price with fallback strategy:
         1. Try database first
@@ -83,10 +205,10 @@ class PriceCalculator:
             }
         
         # 2. Try Cache and Web Search
-        if self.use_web_search and hasattr(self, 'price_search'):
+        if self.price_search is not None:
             
             # ✅ FIXED: Using 'get' instead of 'get_price' to match PriceCache
-            if hasattr(self, 'price_cache'):
+            if self.price_cache is not None:
                 cached_data = self.price_cache.get(brand, model, category)
                 if cached_data:
                     # Extract price if the cache returns a dictionary/object
@@ -97,49 +219,95 @@ class PriceCalculator:
                     }
             
             # 3. Search web (triggered if not in DB or Cache)
-            search_result = self.price_search.search_product_price(brand, model, category)
+            return self._search_reference_price(brand, model, category)
+        
+        return None
+    
+    def _search_reference_price(self, brand, model, category):
+        """Search the web for a reference price and store it in the price cache"""
+        search_result = self.price_search.search_product_price(brand, model, category)
+        
+        if search_result and search_result.get('price'):
+            # ✅ FIXED: Using 'set' instead of 'save_price' to match PriceCache
+            if self.price_cache is not None:
+                self.price_cache.set(brand, model, search_result, category)
             
-            if search_result and search_result.get('price'):
-                # ✅ FIXED: Using 'set' instead of 'save_price' to match PriceCache
-                if hasattr(self, 'price_cache'):
-                    self.price_cache.set(brand, model, search_result, category)
-                
-                return {
-                    'price': search_result['price'],
-                    'source': 'web_search'
-                }
+            return {
+                'price': search_result['price'],
+                'source': 'web_search'
+            }
         
         return None
     
+    def _get_reference_prices_batch(self, keys, max_workers=8):
+        """
+        Resolve reference prices for (brand, model, category) keys in bulk.
+        Keys are grouped by normalized product, so each product is looked up
+        (and searched) at most once, sharing the memo and in-flight searches
+        with _get_reference_price.
+        """
+        # Normalized product -> indexes of the keys that share it
+        groups = {}
+        for i, (brand, model, category) in enumerate(keys):
+            groups.setdefault(_reference_key(brand, model, category), []).append(i)
+        
+        resolved = {}
+        misses = []
+        for norm_key, indexes in groups.items():
+            reference = self._reference_cache.get(norm_key)
+            if reference is None:
+                brand, model, _category = keys[indexes[0]]
+                db_price = self.price_db.get_price(brand, model)
+                if db_price and db_price.get('price'):
+                    reference = {'price': db_price['price'], 'source': 'database'}
+                    self._reference_cache.set(norm_key, reference)
+            if reference is None:
+                misses.append(norm_key)
+            else:
+                resolved[norm_key] = reference
+        
+        if misses and self.price_search is not None:
+            if self.price_cache is not None:
+                cached = self.price_cache.get_many([keys[groups[k][0]] for k in misses])
+                for norm_key, cached_data in zip(misses, cached):
+                    if cached_data:
+                        price_val = cached_data.get('price') if isinstance(cached_data, dict) else cached_data
+                        reference = {'price': price_val, 'source': 'cache'}
+                        self._reference_cache.set(norm_key, reference)
+                        resolved[norm_key] = reference
+                misses = [k for k in misses if k not in resolved]
+            
+            if misses:
+                def search(norm_key):
+                    brand, model, category = keys[groups[norm_key][0]]
+                    return self._inflight.do(
+                        norm_key, lambda: self._search_reference_price(brand, model, category)
+                    )
+                
+                # Searches are network-bound, so the unique misses run concurrently
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(misses))) as executor:
+                    for norm_key, reference in zip(misses, executor.map(search, misses)):
+                        if reference:
+                            self._reference_cache.set(norm_key, reference)
+                            resolved[norm_key] = reference
+        
+        references = [None] * len(keys)
+        for norm_key, indexes in groups.items():
+            reference = resolved.get(norm_key)
+            for i in indexes:
+                references[i] = reference
+        
+        return references
+    
     def _calculate_usage_depreciation(self, cv_data):
         """Calculate depreciation based on usage duration (years)"""
         usage_years = cv_data.get('usage_years', 1.0)
-        
-        if usage_years < 0.5:
-            return 10.0
-        elif usage_years < 1.0:
-            return 15.0
-        elif usage_years < 2.0:
-            return 25.0
-        elif usage_years < 3.0:
-            return 35.0
-        else:
-            return 45.0
+        return _USAGE_DEPRECIATION[bisect_right(_USAGE_THRESHOLDS, usage_years)]
     
     def _calculate_condition_depreciation(self, cv_data):
         """Calculate depreciation based on overall condition label"""
         condition = cv_data.get('overall_condition', 'good').lower()
-        
-        condition_map = {
-            'excellent': 0.0,
-            'very good': 2.0,
-            'good': 5.0,
-            'fair': 10.0,
-            'poor': 15.0,
-            'damaged': 20.0,
-            'broken': 30.0
-        }
-        return condition_map.get(condition, 5.0)
+        return _CONDITION_DEPRECIATION.get(condition, 5.0)
     
     def _calculate_damage_depreciation(self, cv_data):
         """Calculate impact from specific detected physical issues"""
@@ -149,28 +317,35 @@ class PriceCalculator:
         # Fallback if impact is not pre-calculated
         detected_issues = cv_data.get('detected_issues', [])
         if damage_percentage == 0.0 and detected_issues:
-            severity_weights = {
-                'minor': 2.0, 'moderate': 5.0, 'severe': 10.0, 'critical': 15.0
-            }
-            total = sum(severity_weights.get(i.get('severity', 'minor'), 2.0) for i in detected_issues)
-            damage_percentage = min(total, 25.0)
+            severity_weight = _SEVERITY_DEPRECIATION.get
+            severity_counts = cv_data.get('severity_distribution')
+            if severity_counts and sum(severity_counts.values()) == len(detected_issues):
+                # Per-severity counts cover every issue, so weight the counts
+                # instead of walking the issue dicts
+                total = sum(
+                    severity_weight(severity, 2.0) * count
+                    for severity, count in severity_counts.items()
+                )
+            else:
+                # Weights are positive, so stop summing once the cap is reached
+                total = 0.0
+                for issue in detected_issues:
+                    total += severity_weight(issue.get('severity', 'minor'), 2.0)
+                    if total >= _MAX_ISSUE_DEPRECIATION:
+                        break
+            damage_percentage = min(total, _MAX_ISSUE_DEPRECIATION)
         
         return damage_percentage
 
-    def get_price_explanation(self, pricing_result: dict) -> str:
+    def get_price_explanation(self, pricing_result) -> str:
         """Generate human-readable breakdown for the UI report"""
         if not pricing_result:
             return "Pricing calculation failed."
         
         breakdown = pricing_result.get('discount_breakdown', {})
-        parts = []
-        if breakdown.get('usage', 0) > 0:
-            parts.append(f"{breakdown['usage']:.0f}% for age")
-        if breakdown.get('condition', 0) > 0:
-            parts.append(f"{breakdown['condition']:.0f}% for condition")
-        if breakdown.get('damage', 0) > 0:
-            parts.append(f"{breakdown['damage']:.0f}% for physical damage")
-        
-        explanation = "Breakdown: " + ", ".join(parts)
-        explanation += f". Total discount: {pricing_result.get('discount_percentage', 0):.0f}%"
-        return explanation
\ No newline at end of file
+        parts = ", ".join(
+            f"{breakdown[key]:.0f}% for {label}"
+            for key, label in _BREAKDOWN_LABELS
+            if breakdown.get(key, 0) > 0
+        )
+        return f"Breakdown: {parts}. Total discount: {pricing_result.get('discount_percentage', 0):.0f}%"
\ No newline at end of file
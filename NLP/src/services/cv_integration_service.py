@@ -3,14 +3,42 @@ CV Integration Service - Enhanced with pricing validation and better error handl
 Works with existing codebase methods
 """
 
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
-from dotenv import load_dotenv
 
 from src.cv_analysis.condition_evaluator import ConditionEvaluator
 from src.external.product_specs_extractor import ProductSpecsExtractor
 from src.pricing.price_calculator import PriceCalculator
-from src.nlp_engine.bilingual_report_generator import BilingualReportGenerator, validate_pricing_logic
+from src.nlp_engine.bilingual_report_generator import (
+    get_bilingual_generator, validate_pricing_logic, validate_pricing_logic_batch
+)
+
+logger = logging.getLogger(__name__)
+
+# Bilingual report used when the report generator fails completely
+_MINIMAL_REPORT_EN = (
+    "This {product_name} is in {condition} condition and has been "
+    "professionally inspected. The fair market price is EGP {used_price:,.2f}, "
+    "representing a {discount:.0f}% discount from the original price of "
+    "EGP {new_price:,.2f}."
+)
+
+_MINIMAL_REPORT_AR = (
+    "جهاز {product_name} في حالة {condition} وتم فحصه بشكل احترافي. "
+    "السعر العادل في السوق هو {used_price:,.2f} جنيه مصري، "
+    "مما يمثل خصم {discount:.0f}٪ من السعر الأصلي البالغ {new_price:,.2f} جنيه مصري."
+)
+
+# Lines of format_pricing_summary
+_SUMMARY_PRICES_TEMPLATE = (
+    "**Original Price:** EGP {new_price:,.2f}\n"
+    "**Used Price:** EGP {used_price:,.2f}\n"
+    "**Discount:** {discount:.0f}%"
+)
+_SUMMARY_MARKET_TEMPLATE = "**Market Average:** EGP {market:,.2f}"
 
 class CVIntegrationService:
     """
@@ -18,30 +46,34 @@ class CVIntegrationService:
     Supports both database-driven and web-search-driven pricing.
     """
     
-    def __init__(self):
+    def __init__(self, serpapi_key: Optional[str] = None):
         """
         Simple initialization using existing codebase structure.
         Works with PriceCalculator that handles both database and web search.
-        """
-        load_dotenv()
         
+        Args:
+            serpapi_key: SerpAPI key; defaults to the SERPAPI_KEY environment variable
+        """
         # Initialize core services
         self.condition_evaluator = ConditionEvaluator()
         self.specs_extractor = ProductSpecsExtractor()
-        self.report_generator = BilingualReportGenerator()
+        self.report_generator = get_bilingual_generator()
+        
+        # Runs specs extraction alongside pricing (independent network calls)
+        self._executor = ThreadPoolExecutor(max_workers=4)
         
         # Initialize pricing calculator
         # Check if SERPAPI is available
-        self.serpapi_key = os.getenv("SERPAPI_KEY")
+        self.serpapi_key = serpapi_key or os.getenv("SERPAPI_KEY")
         
         if self.serpapi_key:
-            print("✅ SERPAPI configured - will use for pricing fallback")
+            logger.info("SERPAPI configured - will use for pricing fallback")
             self.price_calculator = PriceCalculator(
                 use_web_search=True,
                 serpapi_key=self.serpapi_key
             )
         else:
-            print("⚠️ SERPAPI not found - using database only")
+            logger.warning("SERPAPI not found - using database only")
             self.price_calculator = PriceCalculator(use_web_search=False)
     
     def process_complete_workflow(
@@ -69,13 +101,45 @@ class CVIntegrationService:
                 "error": str (if failed)
             }
         """
+        for stage, payload in self.iter_complete_workflow(
+            product_name, product_type, usage_years, gemini_analysis
+        ):
+            if stage == 'complete':
+                return payload
+    
+    def iter_complete_workflow(
+        self, 
+        product_name: str, 
+        product_type: str,
+        usage_years: float,
+        gemini_analysis: dict,
+        stream_report: bool = False
+    ):
+        """
+        Staged version of process_complete_workflow, used for streaming.
+        Pricing is yielded as soon as it is known, before the report is generated.
+        With stream_report, report text is also yielded as Gemini produces it.
+        
+        Yields:
+            ("pricing", {"pricing": {...}, "pricing_validation": {...}})
+            ("report_delta", {"text": str})  # only with stream_report
+            ("complete", <same dict process_complete_workflow returns>)
+        """
         
         try:
             # Step 1: Parse product name
             brand, model = self._parse_product_name(product_name)
             
-            # Step 2: Evaluate condition from CV analysis
-            print(f"🔍 Evaluating condition from CV analysis...")
+            # Step 2: Get product specifications in the background; only the
+            # report needs them, so they overlap with condition evaluation
+            # and the pricing lookup
+            logger.debug("Extracting specs for: %s", product_name)
+            specs_future = self._executor.submit(
+                self._extract_specs, product_name, brand, model, product_type
+            )
+            
+            # Step 3: Evaluate condition from CV analysis
+            logger.debug("Evaluating condition from CV analysis")
             cv_output = self.condition_evaluator.evaluate_from_gemini(
                 gemini_analysis, usage_years
             )
@@ -83,44 +147,27 @@ class CVIntegrationService:
             # IMPORTANT: Add usage_years to cv_output for report generator
             cv_output['usage_years'] = usage_years
             
-            # Step 3: Get product specifications
-            print(f"📦 Extracting specs for: {product_name}")
-            
-            try:
-                product_specs = self.specs_extractor.extract_specs(
-                    brand, model, product_type
-                )
-            except Exception as e:
-                print(f"⚠️ Specs extraction failed: {e}")
-                # Create minimal specs if extraction fails
-                product_specs = {
-                    'product_name': product_name,
-                    'brand': brand,
-                    'model': model,
-                    'specifications': {}
-                }
-            
             # Step 4: Calculate pricing
             # PriceCalculator.calculate_used_price handles both database and web search
-            print(f"💰 Calculating pricing...")
+            logger.debug("Calculating pricing")
             
             pricing_data = self.price_calculator.calculate_used_price(
                 brand, model, cv_output, category=product_type
             )
             
             if not pricing_data:
-                return {
+                yield 'complete', {
                     "success": False,
                     "error": "price_not_found",
                     "message": f"Could not find pricing data for '{product_name}'"
                 }
+                return
             
             # Step 4.5: NEW - Validate pricing logic
-            print(f"✅ Validating pricing logic...")
+            logger.debug("Validating pricing logic")
             
-            market_price = None
-            if pricing_data.get('search_details'):
-                market_price = pricing_data['search_details'].get('best_price')
+            search_details = pricing_data.get('search_details')
+            market_price = search_details.get('best_price') if search_details else None
             
             validation = validate_pricing_logic(
                 used_price=pricing_data.get('calculated_used_price', 0),
@@ -131,34 +178,49 @@ class CVIntegrationService:
             
             # Print warnings if any
             if not validation['valid']:
-                print("⚠️ PRICING VALIDATION WARNINGS:")
-                for warning in validation['warnings']:
-                    print(f"   {warning}")
+                logger.warning("Pricing validation warnings: %s", validation['warnings'])
             else:
-                print(f"✅ Pricing validated: {validation['discount']:.0f}% discount looks reasonable")
+                logger.debug("Pricing validated: %.0f%% discount looks reasonable", validation['discount'])
+            
+            yield 'pricing', {
+                'pricing': pricing_data,
+                'pricing_validation': validation
+            }
             
             # Step 5: Generate bilingual report
-            print(f"📝 Generating bilingual report with Gemini...")
+            logger.debug("Generating bilingual report with Gemini")
             
-            search_details = pricing_data.get('search_details')
+            product_specs = specs_future.result()
             
             try:
-                bilingual_report = self.report_generator.generate_complete_report(
-                    product_specs=product_specs,
-                    cv_data=cv_output,
-                    pricing_data=pricing_data,
-                    search_details=search_details
-                )
+                if stream_report:
+                    for report_stage, report_payload in self.report_generator.iter_complete_report(
+                        product_specs=product_specs,
+                        cv_data=cv_output,
+                        pricing_data=pricing_data,
+                        search_details=search_details
+                    ):
+                        if report_stage == 'delta':
+                            yield 'report_delta', {'text': report_payload}
+                        else:
+                            bilingual_report = report_payload
+                else:
+                    bilingual_report = self.report_generator.generate_complete_report(
+                        product_specs=product_specs,
+                        cv_data=cv_output,
+                        pricing_data=pricing_data,
+                        search_details=search_details
+                    )
                 
                 # Check if report generation succeeded
                 report_status = bilingual_report.get('status', 'unknown')
                 if report_status == 'fallback':
-                    print("⚠️ Using fallback report (API issue)")
+                    logger.warning("Using fallback report (API issue)")
                 elif report_status == 'success':
-                    print("✅ Report generated successfully")
+                    logger.debug("Report generated successfully")
                     
-            except Exception as e:
-                print(f"❌ Report generation failed: {e}")
+            except Exception:
+                logger.exception("Report generation failed")
                 # Generate minimal report
                 bilingual_report = self._generate_minimal_report(
                     product_name, cv_output, pricing_data
@@ -179,18 +241,36 @@ class CVIntegrationService:
                 from_database=bool(pricing_data.get('price_metadata', {}).get('source') == 'database')
             )
             
-            return response
+            yield 'complete', response
             
         except Exception as e:
-            print(f"❌ Workflow Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Workflow error")
             
-            return {
+            yield 'complete', {
                 "success": False,
                 "error": f"Processing failed: {str(e)}"
             }
     
+    def _extract_specs(
+        self, 
+        product_name: str, 
+        brand: str, 
+        model: str, 
+        product_type: str
+    ) -> Dict:
+        """Get product specifications, falling back to minimal specs on failure"""
+        try:
+            return self.specs_extractor.extract_specs(brand, model, product_type)
+        except Exception as e:
+            logger.warning("Specs extraction failed: %s", e)
+            # Create minimal specs if extraction fails
+            return {
+                'product_name': product_name,
+                'brand': brand,
+                'model': model,
+                'specifications': {}
+            }
+    
     def _parse_product_name(self, product_name: str) -> Tuple[str, str]:
         """Extract brand and model from product name"""
         parts = product_name.split(maxsplit=1)
@@ -213,18 +293,15 @@ class CVIntegrationService:
         new_price = pricing_data.get('reference_new_price', 0)
         discount = pricing_data.get('discount_percentage', 0)
         
-        english = (
-            f"This {product_name} is in {condition} condition and has been "
-            f"professionally inspected. The fair market price is EGP {used_price:,.2f}, "
-            f"representing a {discount:.0f}% discount from the original price of "
-            f"EGP {new_price:,.2f}."
-        )
-        
-        arabic = (
-            f"جهاز {product_name} في حالة {condition} وتم فحصه بشكل احترافي. "
-            f"السعر العادل في السوق هو {used_price:,.2f} جنيه مصري، "
-            f"مما يمثل خصم {discount:.0f}٪ من السعر الأصلي البالغ {new_price:,.2f} جنيه مصري."
-        )
+        fields = {
+            'product_name': product_name,
+            'condition': condition,
+            'used_price': used_price,
+            'new_price': new_price,
+            'discount': discount
+        }
+        english = _MINIMAL_REPORT_EN.format_map(fields)
+        arabic = _MINIMAL_REPORT_AR.format_map(fields)
         
         return {
             'english': english,
@@ -304,9 +381,8 @@ class CVIntegrationService:
             
             if pricing:
                 # Validate pricing
-                market_price = None
-                if pricing.get('search_details'):
-                    market_price = pricing['search_details'].get('best_price')
+                search_details = pricing.get('search_details')
+                market_price = search_details.get('best_price') if search_details else None
                 
                 validation = validate_pricing_logic(
                     used_price=pricing.get('calculated_used_price', 0),
@@ -343,12 +419,43 @@ class CVIntegrationService:
             market_price=market_price,
             condition=condition
         )
+    
+    def validate_existing_pricing_batch(
+        self,
+        used_prices,
+        new_prices,
+        market_prices=None,
+        conditions=None
+    ) -> Dict:
+        """
+        Validate many prices at once (e.g. a whole catalog).
+        Takes equal-length arrays; see validate_pricing_logic_batch.
+        """
+        return validate_pricing_logic_batch(
+            used_prices,
+            new_prices,
+            market_prices=market_prices,
+            conditions=conditions
+        )
 
 
 # ============================================
 # HELPER FUNCTIONS FOR STREAMLIT INTEGRATION
 # ============================================
 
+@lru_cache(maxsize=1)
+def _streamlit():
+    """
+    Resolve streamlit on first use (None when not installed). Not imported at
+    module level so the API server never pays for it.
+    """
+    try:
+        import streamlit
+    except ImportError:
+        return None
+    return streamlit
+
+
 def display_pricing_validation(validation: Dict) -> None:
     """
     Display validation results in Streamlit UI.
@@ -357,49 +464,58 @@ def display_pricing_validation(validation: Dict) -> None:
     if 'validation' in result['pricing_validation']:
         display_pricing_validation(result['pricing_validation'])
     """
-    try:
-        import streamlit as st
-        
-        if validation['valid']:
-            st.success(f"✅ Pricing validated: {validation['discount']:.0f}% discount is reasonable")
+    valid = validation['valid']
+    if valid:
+        message = f"✅ Pricing validated: {validation['discount']:.0f}% discount is reasonable"
+        warnings = ()
+    else:
+        message = "⚠️ Pricing Validation Warnings:"
+        warnings = validation['warnings']
+    
+    st = _streamlit()
+    if st is not None:
+        if valid:
+            st.success(message)
         else:
-            st.warning("⚠️ Pricing Validation Warnings:")
-            for warning in validation['warnings']:
+            st.warning(message)
+            for warning in warnings:
                 st.warning(warning)
-    except ImportError:
+    else:
         # Not in Streamlit environment, just print
-        if validation['valid']:
-            print(f"✅ Pricing validated: {validation['discount']:.0f}% discount is reasonable")
-        else:
-            print("⚠️ Pricing Validation Warnings:")
-            for warning in validation['warnings']:
-                print(f"  {warning}")
+        print(message)
+        for warning in warnings:
+            print(f"  {warning}")
 
 
-def format_pricing_summary(pricing_data: Dict, validation: Dict = None) -> str:
-    """
-    Format pricing data for display.
-    Returns a formatted string with all pricing details.
-    """
-    lines = []
+def _pricing_summary_lines(pricing_data: Dict, validation: Optional[Dict]):
+    """Yield the lines of format_pricing_summary"""
+    get = pricing_data.get
     
     # Basic pricing
-    lines.append(f"**Original Price:** EGP {pricing_data.get('reference_new_price', 0):,.2f}")
-    lines.append(f"**Used Price:** EGP {pricing_data.get('calculated_used_price', 0):,.2f}")
-    lines.append(f"**Discount:** {pricing_data.get('discount_percentage', 0):.0f}%")
+    yield _SUMMARY_PRICES_TEMPLATE.format(
+        new_price=get('reference_new_price', 0),
+        used_price=get('calculated_used_price', 0),
+        discount=get('discount_percentage', 0)
+    )
     
     # Market comparison if available
-    if pricing_data.get('search_details', {}).get('best_price'):
-        market = pricing_data['search_details']['best_price']
-        lines.append(f"**Market Average:** EGP {market:,.2f}")
+    market = (get('search_details') or {}).get('best_price')
+    if market:
+        yield _SUMMARY_MARKET_TEMPLATE.format(market=market)
     
     # Validation status
     if validation:
         if validation['valid']:
-            lines.append("✅ **Status:** Pricing validated")
+            yield "✅ **Status:** Pricing validated"
         else:
-            lines.append("⚠️ **Status:** Review recommended")
+            yield "⚠️ **Status:** Review recommended"
             for warning in validation['warnings']:
-                lines.append(f"  - {warning}")
-    
-    return "\n".join(lines)
\ No newline at end of file
+                yield f"  - {warning}"
+
+
+def format_pricing_summary(pricing_data: Dict, validation: Dict = None) -> str:
+    """
+    Format pricing data for display.
+    Returns a formatted string with all pricing details.
+    """
+    return "\n".join(_pricing_summary_lines(pricing_data, validation))
\ No newline at end of file
@@ -1,5 +1,6 @@
-import json
 import os
+from functools import lru_cache
+import orjson
 
 class Config:
     """Configuration manager for the NLP module"""
@@ -8,38 +9,59 @@ class Config:
     CONFIG_DIR = os.path.join(BASE_DIR, 'config')
     DATA_DIR = os.path.join(BASE_DIR, 'data')
     
+    # Numerical weight per severity level (unknown severities weigh 1)
+    SEVERITY_WEIGHTS = {
+        'minor': 1,
+        'moderate': 2,
+        'severe': 3
+    }
+    
+    # Priority per issue type (unknown types have priority 0)
+    ISSUE_PRIORITIES = {
+        'crack': 5,
+        'dent': 4,
+        'scratch': 3,
+        'discoloration': 2,
+        'wear': 1
+    }
+    
     @staticmethod
+    @lru_cache(maxsize=1)
     def load_templates():
-        """Load text templates from config file"""
+        """Load text templates from config file (read once; treat as read-only)"""
         templates_path = os.path.join(Config.CONFIG_DIR, 'templates.json')
-        with open(templates_path, 'r') as f:
-            return json.load(f)
+        with open(templates_path, 'rb') as f:
+            return orjson.loads(f.read())
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def load_mock_data():
-        """Load mock CV output for testing"""
+        """Load mock CV output for testing (read once; treat as read-only)"""
         mock_path = os.path.join(Config.DATA_DIR, 'mock_cv_output.json')
-        with open(mock_path, 'r') as f:
-            return json.load(f)
+        with open(mock_path, 'rb') as f:
+            return orjson.loads(f.read())
     
     @staticmethod
     def get_severity_weight(severity):
         """Get numerical weight for severity levels"""
-        weights = {
-            'minor': 1,
-            'moderate': 2,
-            'severe': 3
-        }
-        return weights.get(severity, 1)
+        return Config.SEVERITY_WEIGHTS.get(severity, 1)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def canonical_issue_type(issue_type):
+        """Map CV spelling variants ('scratches', 'Cracked') onto a known issue type"""
+        if not isinstance(issue_type, str):
+            return issue_type
+        
+        lowered = issue_type.lower()
+        if lowered in Config.ISSUE_PRIORITIES:
+            return lowered
+        
+        # Longest known type the variant starts with, if any
+        matches = [known for known in Config.ISSUE_PRIORITIES if lowered.startswith(known)]
+        return max(matches, key=len) if matches else issue_type
     
     @staticmethod
     def get_issue_priority(issue_type):
         """Define priority for different issue types"""
-        priorities = {
-            'crack': 5,
-            'dent': 4,
-            'scratch': 3,
-            'discoloration': 2,
-            'wear': 1
-        }
-        return priorities.get(issue_type, 0)
\ No newline at end of file
+        return Config.ISSUE_PRIORITIES.get(Config.canonical_issue_type(issue_type), 0)
\ No newline at end of file
@@ -0,0 +1,31 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+_listener = None
+
+def configure_logging(level=logging.INFO):
+    """
+    Route log records through a queue to a background writer thread.
+    Request threads only enqueue the record; formatting and stream I/O
+    happen off the request path. Safe to call more than once.
+    """
+    global _listener
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s %(levelname)s %(name)s: %(message)s'
+    ))
+    
+    log_queue = queue.SimpleQueue()
+    root.handlers = [QueueHandler(log_queue)]
+    
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,30 @@
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+    Allows short bursts of up to `burst` calls while holding the sustained
+    rate to `max_rate` calls per `period` seconds. Waiting callers reserve
+    their slot under the lock and sleep outside it, so they are served in
+    arrival order without blocking one another.
+    """
+    
+    def __init__(self, max_rate, period=60.0, burst=1):
+        self.rate = max_rate / period
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if wait:
+            time.sleep(wait)
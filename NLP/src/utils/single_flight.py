@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import Future
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+    The first caller runs the function; callers arriving while it is in
+    flight wait for and share its result (or exception).
+    """
+    
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key, fn):
+        """Run fn() once per in-flight key and return its result"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
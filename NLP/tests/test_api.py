@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.main import app
+
+class TestBatchEndpoint(unittest.TestCase):
+    """Test cases for the /batch endpoint"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared test client once for all tests"""
+        cls.client = app.test_client()
+
+    def test_malformed_json_is_rejected(self):
+        """Test a body that is not JSON gets a 400, not a 500"""
+        response = self.client.post(
+            '/batch', data=b'{not json', content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.get_json())
+
+    def test_non_object_body_fails_only_its_entry(self):
+        """Test a list/string sub-request body gets a per-entry 400"""
+        response = self.client.post('/batch', json={'requests': [
+            {'path': '/cv-to-pricing', 'body': ['not', 'an', 'object']},
+            {'path': '/cv-to-pricing', 'body': 'text'},
+            {'path': '/cv-to-pricing', 'body': {'product_name': 'iPhone 13'}}
+        ]})
+
+        self.assertEqual(response.status_code, 200)
+        statuses = [entry['status'] for entry in response.get_json()['responses']]
+        self.assertEqual(statuses, [400, 400, 400])
+
+class TestCvToPricingEndpoint(unittest.TestCase):
+    """Test cases for the /cv-to-pricing endpoints"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared test client once for all tests"""
+        cls.client = app.test_client()
+
+    def test_malformed_json_is_rejected(self):
+        """Test a body that is not JSON gets a 400 on both routes, not a 500"""
+        for path in ('/cv-to-pricing', '/cv-to-pricing/stream'):
+            response = self.client.post(
+                path, data=b'{not json', content_type='application/json'
+            )
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json(), {'error': 'Request body is not valid JSON'})
+
+if __name__ == '__main__':
+    unittest.main()
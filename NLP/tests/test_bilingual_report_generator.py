@@ -0,0 +1,36 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.nlp_engine.bilingual_report_generator import BilingualReportGenerator
+
+class TestTemplateShortcut(unittest.TestCase):
+    """Test cases for skipping the LLM report"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared generator once for all tests"""
+        cls.generator = BilingualReportGenerator()
+
+    def _sufficient(self, cv_data):
+        summary = self.generator._extract_condition_from_cv(cv_data.get('analysis_results', {}))
+        return self.generator._template_sufficient(cv_data, 'Device', summary, 10000, 6000, 40)
+
+    def test_clean_device_uses_template(self):
+        """Test a device without issues and a normal discount skips the LLM"""
+        self.assertTrue(self._sufficient({'detected_issues': [], 'issues_count': 0}))
+
+    def test_evaluator_issues_disable_shortcut(self):
+        """Test issues from the condition evaluator (no analysis_results) need the LLM"""
+        cv_data = {
+            'detected_issues': [{'type': 'scratch', 'severity': 'minor', 'location': 'back'}],
+            'issues_count': 1
+        }
+
+        self.assertFalse(self._sufficient(cv_data))
+        self.assertFalse(self._sufficient({'issues_count': 2}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pricing.discount_explainer import DiscountExplainer
+
+class TestDiscountExplainer(unittest.TestCase):
+    """Test cases for market comparison"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared explainer once for all tests"""
+        cls.explainer = DiscountExplainer()
+
+    def test_batch_matches_scalar(self):
+        """Test batch comparison gives the scalar message for every price"""
+        market_average = 1000.0
+        used_prices = [500, 850, 895, 899.9, 900, 950, 1000, 1100, 1100.1, 1105, 1250, 2000]
+
+        batch = self.explainer.compare_to_market_batch(used_prices, market_average)
+
+        self.assertEqual(
+            list(batch),
+            [self.explainer.compare_to_market(price, market_average) for price in used_prices]
+        )
+
+    def test_batch_without_market_average(self):
+        """Test batch comparison mirrors the scalar guards"""
+        self.assertIsNone(self.explainer.compare_to_market_batch([900, 1000], None))
+        self.assertIsNone(self.explainer.compare_to_market(900, None))
+
+        with self.assertRaises(ZeroDivisionError):
+            self.explainer.compare_to_market(900, 0)
+        with self.assertRaises(ZeroDivisionError):
+            self.explainer.compare_to_market_batch([900], 0)
+
+if __name__ == '__main__':
+    unittest.main()
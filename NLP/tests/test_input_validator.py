@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_processing.input_validator import InputValidator
+
+class TestInputValidator(unittest.TestCase):
+    """Test cases for CV and pricing input validation"""
+
+    def _cv_data(self, **overrides):
+        cv_data = {
+            'item_id': 'item-1',
+            'condition_score': 7.5,
+            'detected_issues': [
+                {'type': 'scratch', 'location': 'back', 'severity': 'minor', 'confidence': 0.9}
+            ],
+            'overall_condition': 'good'
+        }
+        cv_data.update(overrides)
+        return cv_data
+
+    def test_valid_cv_output(self):
+        """Test a complete CV payload passes"""
+        self.assertEqual(InputValidator.validate_cv_output(self._cv_data()), {'valid': True, 'errors': []})
+
+    def test_messages_keep_field_order(self):
+        """Test missing fields and valid conditions are listed in declaration order"""
+        result = InputValidator.validate_cv_output({'overall_condition': 'mint'})
+
+        self.assertEqual(result['errors'], [
+            "Missing required field: item_id",
+            "Missing required field: condition_score",
+            "Missing required field: detected_issues",
+            "Invalid condition. Use: ['excellent', 'good', 'fair', 'poor']"
+        ])
+
+    def test_malformed_input_reports_errors(self):
+        """Test unhashable conditions and non-object issues or payloads do not raise"""
+        result = InputValidator.validate_cv_output(
+            self._cv_data(overall_condition=['good'], detected_issues=['scratch', None])
+        )
+
+        self.assertFalse(result['valid'])
+        self.assertIn(InputValidator.INVALID_CONDITION_ERROR, result['errors'])
+        self.assertIn("Issue 0: Missing field 'type'", result['errors'])
+        self.assertIn("Issue 1: Missing field 'confidence'", result['errors'])
+
+        self.assertFalse(InputValidator.validate_cv_output(None)['valid'])
+        self.assertFalse(InputValidator.validate_pricing_data(['reference_new_price'])['valid'])
+
+if __name__ == '__main__':
+    unittest.main()
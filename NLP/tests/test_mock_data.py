@@ -11,11 +11,12 @@ from src.utils.config import Config
 class TestMockDataIntegration(unittest.TestCase):
     """Integration tests using mock CV data"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.price_calculator = PriceCalculator()
-        self.text_generator = TextGenerator()
-        self.mock_data = Config.load_mock_data()
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures once for all tests"""
+        cls.price_calculator = PriceCalculator()
+        cls.text_generator = TextGenerator()
+        cls.mock_data = Config.load_mock_data()
     
     def test_camera_example(self):
         """Test with camera mock data"""
@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import orjson
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.external.price_cache import PriceCache
+
+class TestPriceCache(unittest.TestCase):
+    """Test cases for the journaled price cache"""
+
+    def setUp(self):
+        """Set up a fresh cache directory per test"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self._tmp.name, 'price_cache.json')
+
+    def tearDown(self):
+        """Clean up test cache"""
+        self._tmp.cleanup()
+
+    def _write_snapshot(self, entries):
+        with open(self.cache_file, 'wb') as f:
+            f.write(orjson.dumps(entries))
+
+    def test_journal_replay(self):
+        """Test updates survive a reload before any compaction"""
+        cache = PriceCache(cache_file=self.cache_file, compact_every=100)
+        cache.set('Apple', 'iPhone 13', {'price': 999.0})
+        cache.set('Apple', 'iPhone 13', {'price': 899.0})
+
+        self.assertFalse(os.path.exists(self.cache_file))
+        self.assertTrue(os.path.exists(cache.journal_file))
+
+        reloaded = PriceCache(cache_file=self.cache_file)
+        self.assertEqual(reloaded.get('Apple', 'iPhone 13'), {'price': 899.0})
+
+    def test_legacy_timestamp_entries(self):
+        """Test snapshot entries with only an ISO 'timestamp' are honoured"""
+        fresh = datetime.now().isoformat()
+        stale = (datetime.now() - timedelta(days=30)).isoformat()
+        self._write_snapshot({
+            'apple_iphone_13': {'timestamp': fresh, 'price_data': {'price': 999.0}},
+            'samsung_galaxy_s21': {'timestamp': stale, 'price_data': {'price': 500.0}}
+        })
+
+        cache = PriceCache(cache_file=self.cache_file)
+
+        self.assertEqual(cache.get('Apple', 'iPhone 13'), {'price': 999.0})
+        self.assertIsNone(cache.get('Samsung', 'Galaxy S21'))
+
+    def test_expiry_writes_tombstone(self):
+        """Test an expired entry stays deleted after a reload"""
+        cache = PriceCache(cache_file=self.cache_file, compact_every=100)
+        cache.set('Apple', 'iPhone 13', {'price': 999.0})
+        cache.cache['apple_iphone_13']['ts'] = int(time.time()) - 8 * 86400
+        self._write_snapshot(cache.cache)
+
+        self.assertEqual(cache.get_many([('Apple', 'iPhone 13', None)]), [None])
+
+        reloaded = PriceCache(cache_file=self.cache_file)
+        self.assertNotIn('apple_iphone_13', reloaded.cache)
+
+    def test_compaction(self):
+        """Test the journal is folded into the snapshot and removed"""
+        cache = PriceCache(cache_file=self.cache_file, compact_every=2)
+        cache.set('Apple', 'iPhone 13', {'price': 999.0})
+        cache.set('Apple', 'iPhone 14', {'price': 1099.0})
+
+        self.assertTrue(os.path.exists(self.cache_file))
+        self.assertFalse(os.path.exists(cache.journal_file))
+
+        reloaded = PriceCache(cache_file=self.cache_file)
+        self.assertEqual(reloaded.get('Apple', 'iPhone 14'), {'price': 1099.0})
+
+    def test_concurrent_sets_are_not_lost(self):
+        """Test appends racing with compaction all survive a reload"""
+        cache = PriceCache(cache_file=self.cache_file, compact_every=7)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(
+                lambda i: cache.set('Brand', f'Model {i}', {'price': float(i)}), range(200)
+            ))
+
+        reloaded = PriceCache(cache_file=self.cache_file)
+        self.assertEqual(len(reloaded.cache), 200)
+
+if __name__ == '__main__':
+    unittest.main()
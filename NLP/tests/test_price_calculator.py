@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pricing.price_calculator import PriceCalculator
+
+class _EmptyDatabase:
+    """Price database that knows no products"""
+
+    def get_price(self, brand, model):
+        return None
+
+class _CountingSearch:
+    """Search engine double that counts searches per product"""
+
+    def __init__(self, price=10000.0):
+        self.price = price
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def search_product_price(self, brand, model, category=None):
+        with self._lock:
+            self.calls.append((brand, model, category))
+        return {'price': self.price}
+
+class TestReferencePrices(unittest.TestCase):
+    """Test cases for reference price resolution"""
+
+    def setUp(self):
+        """Set up a calculator whose web search is a counting double"""
+        self.calculator = PriceCalculator(use_web_search=False)
+        self.calculator.price_db = _EmptyDatabase()
+        self.search = _CountingSearch()
+        self.calculator.price_search = self.search
+
+    def test_batch_searches_each_product_once(self):
+        """Test duplicate and differently-cased keys share one search"""
+        keys = [('Apple', 'iPhone 13', None)] * 3 + [('apple', ' iphone 13 ', None)]
+
+        references = self.calculator._get_reference_prices_batch(keys)
+
+        self.assertEqual(len(self.search.calls), 1)
+        self.assertEqual([r['price'] for r in references], [10000.0] * 4)
+
+    def test_batch_reuses_single_lookup_memo(self):
+        """Test a batch after a single lookup does not search again"""
+        self.calculator._get_reference_price('Apple', 'iPhone 13', None)
+
+        references = self.calculator._get_reference_prices_batch([('APPLE', 'iPhone 13', None)])
+
+        self.assertEqual(len(self.search.calls), 1)
+        self.assertEqual(references[0]['source'], 'web_search')
+
+class TestVectorizedPricing(unittest.TestCase):
+    """Test cases for calculate_used_prices_array"""
+
+    def test_array_matches_scalar_pricing(self):
+        """Test the array path agrees at usage thresholds and the 85% cap"""
+        calculator = PriceCalculator(use_web_search=False)
+        cv_items = [
+            {'usage_years': years, 'overall_condition': condition, 'total_discount_impact': impact}
+            for years in (0.0, 0.49, 0.5, 0.99, 1.0, 1.99, 2.0, 2.99, 3.0, 8.0)
+            for condition, impact in (('excellent', 0.0), ('fair', 0.12), ('broken', 0.25))
+        ]
+        reference_prices = [1000.0 + 250.0 * i for i in range(len(cv_items))]
+
+        expected = [
+            calculator._price_from_reference('Brand', 'Model', cv_data, price, 'manual')
+            for cv_data, price in zip(cv_items, reference_prices)
+        ]
+        used_prices, discounts = calculator.calculate_used_prices_array(
+            reference_prices,
+            [cv_data['usage_years'] for cv_data in cv_items],
+            [calculator._calculate_condition_depreciation(cv_data) for cv_data in cv_items],
+            [calculator._calculate_damage_depreciation(cv_data) for cv_data in cv_items]
+        )
+
+        self.assertEqual(list(used_prices), [r['calculated_used_price'] for r in expected])
+        self.assertEqual(list(discounts), [r['discount_percentage'] for r in expected])
+        self.assertEqual(max(discounts), 85.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.external import price_database
+from src.external.price_database import PriceDatabase
+
+class TestPriceDatabase(unittest.TestCase):
+    """Test cases for the shared parse cache"""
+
+    def setUp(self):
+        """Set up a fresh database file per test"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self._tmp.name, 'price_database.json')
+        PriceDatabase(db_file=self.db_file).add_price('Apple', 'iPhone 13', 999.0)
+
+    def tearDown(self):
+        """Clean up test database"""
+        price_database._PARSE_CACHE.pop(os.path.abspath(self.db_file), None)
+        self._tmp.cleanup()
+
+    def test_instances_do_not_share_products(self):
+        """Test mutating one instance's product leaves other loads untouched"""
+        first = PriceDatabase(db_file=self.db_file)
+        first.list_all()['apple_iphone_13']['price'] = 1.0
+        first.search_products('iphone')[0]['model'] = 'edited'
+
+        second = PriceDatabase(db_file=self.db_file)
+
+        self.assertEqual(second.get_price('Apple', 'iPhone 13')['price'], 999.0)
+        self.assertEqual(second.search_products('iphone')[0]['model'], 'iPhone 13')
+
+    def test_cache_keeps_one_entry_per_path(self):
+        """Test repeated saves replace the cached parse instead of adding entries"""
+        db = PriceDatabase(db_file=self.db_file)
+        entries = len(price_database._PARSE_CACHE)
+        for i in range(5):
+            db.add_price('Brand', f'Model {i}', float(i))
+            PriceDatabase(db_file=self.db_file)
+
+        self.assertEqual(len(price_database._PARSE_CACHE), entries)
+        self.assertEqual(PriceDatabase(db_file=self.db_file).get_price('Brand', 'Model 4')['price'], 4.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import sys
 import os
+import tempfile
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -10,15 +11,19 @@ from src.external.price_cache import PriceCache
 class TestPriceSearch(unittest.TestCase):
     """Test cases for price search functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared search engine once for all tests"""
+        cls.search_engine = PriceSearchEngine()
+    
     def setUp(self):
-        """Set up test fixtures"""
-        self.search_engine = PriceSearchEngine()
-        self.cache = PriceCache(cache_file='data/test_cache.json')
+        """Set up a fresh cache per test"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = PriceCache(cache_file=os.path.join(self._tmp.name, 'test_cache.json'))
     
     def tearDown(self):
         """Clean up test cache"""
-        if os.path.exists('data/test_cache.json'):
-            os.remove('data/test_cache.json')
+        self._tmp.cleanup()
     
     def test_build_search_query(self):
         """Test search query construction"""
@@ -37,7 +42,23 @@ class TestPriceSearch(unittest.TestCase):
         
         price = self.search_engine._extract_price_from_text('Invalid text')
         self.assertIsNone(price)
-    
+
+    def test_extract_prices_batch_matches_single(self):
+        """Test batch extraction agrees with the single-snippet path"""
+        snippets = [
+            '$1,299.99',
+            'Price: 599 and 700',
+            '',
+            'Invalid text',
+            'EGP 12,500 official store',
+            '12'
+        ]
+
+        expected = [self.search_engine._extract_price_from_text(s) for s in snippets]
+
+        self.assertEqual(self.search_engine.extract_prices_batch(snippets), expected)
+        self.assertEqual(self.search_engine.extract_prices_batch([]), [])
+
     def test_fallback_price(self):
         """Test fallback pricing"""
         result = self.search_engine._get_fallback_price('Canon', 'EOS 80D', 'camera')
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import threading
+
+import orjson
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.external.product_specs_extractor import ProductSpecsExtractor
+
+class _Response:
+    def __init__(self, payload, status_code=200):
+        self.content = orjson.dumps(payload)
+        self.status_code = status_code
+
+class _FakeSession:
+    """Answers SerpAPI and Gemini calls with canned payloads, counting them"""
+
+    def __init__(self):
+        self.searches = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.searches += 1
+        return _Response({'organic_results': [{'title': params['q'], 'snippet': '6.1 inch'}]})
+
+    def post(self, url, json=None, timeout=None):
+        specs = orjson.dumps({'Display': '6.1 inch', 'RAM': '4GB'}).decode()
+        return _Response({'candidates': [{'content': {'parts': [{'text': specs}]}}]})
+
+class TestProductSpecsExtractor(unittest.TestCase):
+    """Test cases for specs extraction caching"""
+
+    def setUp(self):
+        """Set up an extractor whose HTTP session is a canned double"""
+        self.extractor = ProductSpecsExtractor()
+        self.session = _FakeSession()
+        self.extractor._session = self.session
+
+    def test_cached_specs_are_not_shared(self):
+        """Test mutating a returned result does not change the cached specs"""
+        first = self.extractor.extract_specs('Apple', 'iPhone 13')
+        first['specifications']['RAM'] = 'edited'
+
+        second = self.extractor.extract_specs('apple', ' iPhone 13 ')
+
+        self.assertEqual(self.session.searches, 1)
+        self.assertEqual(second['specifications']['RAM'], '4GB')
+
+    def test_batch_matches_single_calls(self):
+        """Test batch extraction returns per-item results in input order"""
+        items = [('Apple', 'iPhone 13', None), ('Samsung', 'Galaxy S21', 'phone')]
+
+        results = self.extractor.extract_specs_batch(items)
+
+        self.assertEqual(
+            [r['product_name'] for r in results], ['Apple iPhone 13', 'Samsung Galaxy S21']
+        )
+        self.assertEqual(results, [self.extractor.extract_specs(*item) for item in items])
+        self.assertEqual(self.extractor.extract_specs_batch([]), [])
+
+if __name__ == '__main__':
+    unittest.main()
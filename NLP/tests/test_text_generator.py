@@ -10,10 +10,11 @@ from src.utils.config import Config
 class TestTextGenerator(unittest.TestCase):
     """Test cases for text generation"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.text_generator = TextGenerator()
-        self.mock_data = Config.load_mock_data()
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared fixtures once for all tests"""
+        cls.text_generator = TextGenerator()
+        cls.mock_data = Config.load_mock_data()
     
     def test_generate_full_explanation_excellent_condition(self):
         """Test generation for excellent condition item"""
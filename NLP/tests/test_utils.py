@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.ttl_cache import TTLCache
+from src.utils.single_flight import SingleFlight
+from src.utils.rate_limit import TokenBucket
+from src.utils.config import Config
+
+class TestTTLCache(unittest.TestCase):
+    """Test cases for the in-process TTL/LRU cache"""
+    
+    def test_get_and_stats(self):
+        """Test hits, misses and hit rate"""
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set('a', 1)
+        
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['hit_rate'], 0.5)
+    
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted when full"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+    
+    def test_expiry(self):
+        """Test entries expire after ttl"""
+        cache = TTLCache(maxsize=2, ttl=0)
+        cache.set('a', 1)
+        
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for concurrent call coalescing"""
+    
+    def test_concurrent_calls_share_result(self):
+        """Test one execution serves all concurrent callers"""
+        flight = SingleFlight()
+        calls = []
+        
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'report'
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: flight.do('key', slow_call), range(4)))
+        
+        self.assertEqual(results, ['report'] * 4)
+        self.assertEqual(len(calls), 1)
+    
+    def test_exception_propagates(self):
+        """Test errors are raised and the key is released"""
+        flight = SingleFlight()
+        
+        def failing_call():
+            raise ValueError('boom')
+        
+        with self.assertRaises(ValueError):
+            flight.do('key', failing_call)
+        
+        self.assertEqual(flight.do('key', lambda: 'ok'), 'ok')
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the token-bucket rate limiter"""
+    
+    def test_burst_then_throttle(self):
+        """Test burst calls pass immediately and the next one waits"""
+        limiter = TokenBucket(max_rate=10, period=1.0, burst=2)
+        
+        start = time.monotonic()
+        limiter.acquire()
+        limiter.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+        
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+class TestConfig(unittest.TestCase):
+    """Test cases for Config lookups"""
+    
+    def test_issue_type_variants(self):
+        """Test CV spelling variants map onto the known issue priorities"""
+        self.assertEqual(Config.canonical_issue_type('scratches'), 'scratch')
+        self.assertEqual(Config.canonical_issue_type('Cracked'), 'crack')
+        self.assertEqual(Config.get_issue_priority('dented'), Config.get_issue_priority('dent'))
+        self.assertEqual(Config.get_issue_priority('smudge'), 0)
+
+if __name__ == '__main__':
+    unittest.main()